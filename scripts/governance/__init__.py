@@ -0,0 +1 @@
+"""Governance gates. Run them all in one process with: python -m scripts.governance"""
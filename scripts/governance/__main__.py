@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+GOVERNANCE DISPATCHER
+Runs governance gates in a single Python process: interpreter startup and
+stdlib imports are paid once, and per-process caches (git diff, src/ index)
+are shared across gates. The AST gates (silent-catches, type-holes,
+skipped-tests) share a single parse of each file, and srp, behavioral-pairing
+and route-pairing share trees through _ast_index. Exit code is the worst
+exit code of the gates run.
+
+Usage:
+    python -m scripts.governance                    # All default gates
+    python -m scripts.governance noqa mock-tax      # Selected gates
+    python -m scripts.governance --list             # Show available gates
+
+Standalone scripts keep working: python scripts/governance/check_noqa.py
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# Gate modules import their siblings (_git, _jsonio, ...) by bare name
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# gate name -> module exposing run() -> int
+GATES = {
+    "noqa": "check_noqa",
+    "mock-conformance": "check_mock_conformance",
+    "mock-tax": "check_mock_tax",
+    "integration-pairing": "check_integration_pairing",
+    "circular-deps": "check_circular_deps",
+    "silent-catches": "check_silent_catches",
+    "type-holes": "check_type_holes",
+    "skipped-tests": "check_skipped_tests",
+    "type-safety": "check_type_safety",
+    "pydantic": "check_pydantic_boundaries",
+    "security": "check_security_critical",
+    "srp": "srp_check",
+    "behavioral-pairing": "verify_behavioral_pairing",
+    "route-pairing": "verify_integration_pairing",
+    "coverage": "check_per_file_baseline",
+    "supply-chain": "check_hallucinations_pypi",
+    "coverage-ratchet": "check_coverage_ratchet",
+    "mutation": "check_mutation_score",
+}
+# Network / test-suite heavy gates (and coverage, which needs a fresh
+# coverage.json) only run when named explicitly
+OPT_IN_GATES = {"supply-chain", "coverage-ratchet", "mutation", "coverage"}
+
+
+def run_gate(name):
+    """Import a gate and call its run() with default CLI arguments."""
+    module = importlib.import_module(GATES[name])
+    saved_argv = sys.argv
+    sys.argv = [module.__file__]
+    try:
+        return module.run()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = saved_argv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.governance")
+    parser.add_argument("gates", nargs="*", metavar="GATE", help="Gates to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="List available gates")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, module in GATES.items():
+            suffix = " (opt-in)" if name in OPT_IN_GATES else ""
+            print(f"  {name:<20} {module}.py{suffix}")
+        return 0
+
+    unknown = [g for g in args.gates if g not in GATES]
+    if unknown:
+        parser.error(f"unknown gate(s): {', '.join(unknown)} (see --list)")
+
+    selected = args.gates or [g for g in GATES if g not in OPT_IN_GATES]
+    # AST gates selected together parse each file once between them
+    ast_checks = importlib.import_module("_ast_checks")
+    ast_checks.prime(g for g in selected if g in ast_checks.CHECK_MODULES)
+    failed = []
+    rc = 0
+    for name in selected:
+        print(f"\n--- {name} ---")
+        code = run_gate(name)
+        if code:
+            failed.append(name)
+        rc = max(rc, code)
+
+    print(f"\nGovernance: {len(selected)} gate(s) run, {len(failed)} failed")
+    for name in failed:
+        print(f"  FAILED: {name}")
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
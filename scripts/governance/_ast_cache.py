@@ -0,0 +1,70 @@
+"""
+Persistent parsed-AST cache for governance gates.
+Trees are pickled under .memory-layer/cache/ast/ keyed by (path, mtime_ns,
+size), so files untouched since the last run skip tokenizing and parsing.
+The interpreter version is part of the key: AST node classes change between
+Python releases and a pickled tree is only valid for the one that wrote it.
+"""
+
+import ast
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+from pathlib import Path
+
+from _fs import read_for_parse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+AST_CACHE_DIR = PROJECT_ROOT / ".memory-layer" / "cache" / "ast"
+
+_PY_TAG = "{}.{}".format(*sys.version_info[:2])
+
+
+def _cache_path(path, st):
+    raw = f"{_PY_TAG}:{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+    return AST_CACHE_DIR / f"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}.pkl"
+
+
+def load_tree(path):
+    """Parsed ast.Module for path, or None if it cannot be read or parsed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    cache_file = _cache_path(path, st)
+    try:
+        with open(cache_file, "rb") as fh:
+            tree = pickle.load(fh)
+    except Exception:
+        # Missing, truncated or corrupt entry (unpickling can raise nearly
+        # anything): reparse and overwrite it below
+        tree = None
+    if isinstance(tree, ast.Module):
+        return tree
+
+    try:
+        data = read_for_parse(path)
+    except OSError:
+        return None
+    # Plain ast.parse on purpose: compile(..., PyCF_ONLY_AST, optimize=2) returns
+    # the identical tree before 3.13 (PyCF_OPTIMIZED_AST), and srp counts
+    # docstring statement spans, so an optimized tree would change its LOC.
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError):
+        return None
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    try:
+        AST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(tree, fh, protocol=5)
+        tmp.replace(cache_file)
+    except OSError:
+        pass
+    return tree
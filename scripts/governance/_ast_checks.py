@@ -0,0 +1,83 @@
+"""
+Single-parse driver for the AST-based gates.
+Each file is read and parsed once, then every requested check runs on the
+same tree. Files of _fs.MMAP_MIN_BYTES and up are memory-mapped: byte gates scan
+the mapping and ast.parse reads it directly, with no Python-level copy or
+decode of the whole file. Gates run together from the dispatcher call prime() first,
+so silent-catches, type-holes and skipped-tests share one ast.parse per file.
+
+A check module exposes:
+    needs_parse(data) -> bool               cheap gate; False skips ast.parse
+    analyze_source(path, data, tree)        tree is None when gated or unparsable
+
+data is bytes or an mmap: use find()/slicing, not `in` (mmap `in` tests a
+single byte) — data[:] gives bytes when text is really needed.
+"""
+
+import ast
+import importlib
+import mmap
+import os
+from functools import partial
+from pathlib import Path
+
+from _filecache import cached_map_files
+from _fs import read_for_parse
+
+GOVERNANCE_DIR = Path(__file__).resolve().parent
+
+# check name -> gate module implementing it
+CHECK_MODULES = {
+    "silent-catches": "check_silent_catches",
+    "type-holes": "check_type_holes",
+    "skipped-tests": "check_skipped_tests",
+}
+
+_PRIMED = set()
+# absolute path -> {check: result}, filled by whichever gate runs first
+_RESULTS = {}
+
+
+def prime(checks):
+    """Compute these checks together whenever any one of them is run."""
+    _PRIMED.update(c for c in checks if c in CHECK_MODULES)
+
+
+def analyze(file_path, checks):
+    """Read and parse file_path once; return {check: result} for each check."""
+    modules = [(check, importlib.import_module(CHECK_MODULES[check])) for check in checks]
+    try:
+        data = read_for_parse(file_path)
+    except OSError:
+        data = b""
+    try:
+        wanted = {check: module.needs_parse(data) for check, module in modules}
+        tree = None
+        if any(wanted.values()):
+            try:
+                tree = ast.parse(data, filename=str(file_path))
+            except (SyntaxError, ValueError):
+                pass
+        return {
+            check: module.analyze_source(file_path, data, tree if wanted[check] else None)
+            for check, module in modules
+        }
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def run_checks(check, files):
+    """Per-file results of one check, in order; primed sibling checks ride along."""
+    files = list(files)
+    checks = tuple(sorted(_PRIMED | {check}))
+    keys = [os.path.abspath(f) for f in files]
+    missing = [f for f, key in zip(files, keys, strict=True) if check not in _RESULTS.get(key, {})]
+    if missing:
+        sources = [__file__] + [GOVERNANCE_DIR / f"{CHECK_MODULES[c]}.py" for c in checks]
+        fresh = cached_map_files(
+            "ast-" + "+".join(checks), partial(analyze, checks=checks), missing, sources
+        )
+        for f, result in zip(missing, fresh, strict=True):
+            _RESULTS.setdefault(os.path.abspath(f), {}).update(result)
+    return [_RESULTS[key][check] for key in keys]
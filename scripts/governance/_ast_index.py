@@ -0,0 +1,44 @@
+"""
+In-process AST index for governance checks run together.
+get_tree() and read_bytes() memoize per (path, mtime_ns), so checks run from
+one interpreter (the dispatcher) share a single tree and a single read per
+file. Across processes the pickle cache in _ast_cache still spares the parse.
+Trees are shared: callers must not mutate them.
+"""
+
+import os
+from functools import cache
+
+from _ast_cache import load_tree
+
+
+@cache
+def _tree(path, mtime_ns):
+    return load_tree(path)
+
+
+def get_tree(path):
+    """Parsed ast.Module for path, or None if it cannot be read or parsed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _tree(os.path.abspath(path), st.st_mtime_ns)
+
+
+@cache
+def _bytes(path, mtime_ns):
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def read_bytes(path):
+    """Raw content of path, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _bytes(os.path.abspath(path), st.st_mtime_ns)
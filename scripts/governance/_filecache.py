@@ -0,0 +1,87 @@
+"""
+Persistent per-file result cache for governance gates.
+Entries are keyed by absolute path and reused while (mtime_ns, size) is
+unchanged, so untouched files skip reading and parsing on the next run.
+The whole cache is dropped when the gate script (or any listed source) changes.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from _jsonio import dumps, loads
+from _parallel import map_files
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = PROJECT_ROOT / ".memory-layer" / "cache"
+
+
+def _salt(sources):
+    salt = []
+    for source in sources:
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        salt.append([st.st_mtime_ns, st.st_size])
+    return salt
+
+
+def load_cache(cache_file, salt):
+    try:
+        data = loads(cache_file.read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("salt") != salt:
+        return {}
+    return data.get("entries", {})
+
+
+def save_cache(cache_file, salt, entries):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(".tmp")
+    tmp.write_bytes(dumps({"salt": salt, "entries": entries}))
+    tmp.replace(cache_file)
+
+
+def cached_map_files(name, func, files, sources=None):
+    """map_files(func, files), reusing results for files whose stat is unchanged.
+
+    sources are the files whose edits invalidate the cache (default: the file
+    defining func). Results must be JSON-serialisable; tuples come back from
+    the cache as lists.
+    """
+    files = list(files)
+    cache_file = CACHE_DIR / f"{name}.json"
+    salt = _salt(sources or [func.__code__.co_filename])
+    entries = load_cache(cache_file, salt)
+
+    results = [None] * len(files)
+    misses, stamps = [], {}
+    for i, f in enumerate(files):
+        key = os.path.abspath(f)
+        try:
+            st = os.stat(key)
+        except OSError:
+            misses.append(i)
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = entries.get(key)
+        if entry is not None and entry[:2] == stamp:
+            results[i] = entry[2]
+        else:
+            misses.append(i)
+            stamps[key] = stamp
+
+    if misses:
+        fresh = map_files(func, [files[i] for i in misses])
+        for i, result in zip(misses, fresh, strict=True):
+            results[i] = result
+            key = os.path.abspath(files[i])
+            if key in stamps:
+                entries[key] = [*stamps[key], result]
+        try:
+            save_cache(cache_file, salt, entries)
+        except OSError:
+            pass
+    return results
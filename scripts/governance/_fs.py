@@ -0,0 +1,75 @@
+"""
+Shared source-tree walker for governance gates.
+os.scandir DirEntry objects carry cached type info, so the walk avoids the
+extra stat() calls and Path objects of Path.rglob. Each root is walked once
+per process; gates run from the dispatcher reuse the result.
+"""
+
+import mmap
+import os
+
+SKIP_DIRS = frozenset({"__pycache__", ".venv", "venv", "node_modules", ".git", ".tox"})
+
+# Files at least this size are memory-mapped rather than read into memory
+MMAP_MIN_BYTES = 64 * 1024
+
+_WALK_CACHE = {}
+
+
+def _walk_py(root):
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry
+
+
+def iter_py(root):
+    """Yield an os.DirEntry for every .py file under root, sorted by path."""
+    key = os.fspath(root)
+    if key not in _WALK_CACHE:
+        _WALK_CACHE[key] = sorted(_walk_py(key), key=lambda e: e.path)
+    return iter(_WALK_CACHE[key])
+
+
+def iter_py_paths(root, exclude_dirs=SKIP_DIRS):
+    """Yield path strings of non-hidden .py files under root, skipping hidden and excluded dirs.
+
+    Type checks come from the dirent, so only symlinks cost a stat(); like os.walk,
+    symlinked files are yielded and symlinked dirs are not descended.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    if e.name not in exclude_dirs:
+                        stack.append(e.path)
+                elif e.name.endswith(".py") and e.is_file():
+                    yield e.path
+
+
+def read_for_parse(path):
+    """File content as bytes, or a read-only mmap for files of MMAP_MIN_BYTES and up.
+
+    ast.parse and tokenize (via mm.readline) consume an mmap directly, so large
+    files are paged in on demand instead of copied. The caller closes an mmap.
+    """
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size >= MMAP_MIN_BYTES:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return fh.read()
@@ -0,0 +1,84 @@
+"""
+Shared git helpers for governance gates.
+Results are memoized per process, so gates run from one interpreter
+share a single `git diff` instead of forking git once per gate. The
+CI/staged diff is also exported as GOVERNANCE_CHANGED_FILES, so gates
+spawned as child processes (or a CI stage that sets it up front) reuse it.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from subprocess import run
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Newline-separated repo-relative paths; set means "already computed"
+CHANGED_FILES_ENV = "GOVERNANCE_CHANGED_FILES"
+
+
+def _diff_names(*args):
+    # R too: git detects renames by default, and a renamed (possibly edited)
+    # file must be rescanned under its new path
+    cmd = ["git", "diff", "--name-only", "--diff-filter=ACMR", *args]
+    try:
+        result = run(cmd, capture_output=True, text=True, cwd=str(PROJECT_ROOT))
+    except OSError:
+        return ()
+    return tuple(f for f in result.stdout.strip().split("\n") if f)
+
+
+@lru_cache(maxsize=4)
+def changed_files(base_ref="main", staged=False):
+    """Added/copied/modified/renamed files vs origin/<base_ref>...HEAD, or in the index if staged."""
+    if staged:
+        return _diff_names("--cached")
+    return _diff_names(f"origin/{base_ref}...HEAD")
+
+
+@lru_cache(maxsize=4)
+def changed_since(rev):
+    """Added/copied/modified/renamed files between the merge base of rev and HEAD."""
+    return _diff_names(f"{rev}...HEAD")
+
+
+@lru_cache(maxsize=1)
+def _tracked_py_files():
+    try:
+        result = run(
+            ["git", "ls-files", "-z", "--", "*.py"], capture_output=True, cwd=str(PROJECT_ROOT)
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return tuple(f for f in result.stdout.decode("utf-8", "surrogateescape").split("\0") if f)
+
+
+def list_tracked_py_files(directory):
+    """Tracked .py files under directory as absolute Paths, or None outside a git checkout.
+
+    One `git ls-files` replaces walking the tree, and never descends into
+    untracked .venv/, node_modules/ or build output.
+    """
+    tracked = _tracked_py_files()
+    if tracked is None:
+        return None
+    try:
+        rel = Path(directory).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return None
+    prefix = "" if rel == "." else rel + "/"
+    return [PROJECT_ROOT / f for f in tracked if f.startswith(prefix)]
+
+
+def ci_changed_files():
+    """Changed files vs the PR base in CI, staged files locally."""
+    cached = os.environ.get(CHANGED_FILES_ENV)
+    if cached is not None:
+        return tuple(f for f in cached.split("\n") if f)
+    if os.environ.get("CI") == "true":
+        files = changed_files(os.environ.get("GITHUB_BASE_REF", "main"))
+    else:
+        files = changed_files(staged=True)
+    os.environ[CHANGED_FILES_ENV] = "\n".join(files)
+    return files
@@ -0,0 +1,36 @@
+"""
+Shared JSON I/O for governance caches and baselines.
+Uses orjson when installed (pip install orjson), stdlib json otherwise;
+indented (committed baseline) output is always stdlib json.
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+catching json.JSONDecodeError either way.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent=False, sort_keys=False):
+    """Serialize to UTF-8 bytes.
+
+    indent=True output is for committed baselines and always goes through
+    stdlib json (indent=2), so the bytes do not depend on whether orjson is
+    installed: orjson writes non-ASCII raw and formats exponents differently
+    (1e16 vs 1e+16). Compact output, used for local caches, prefers orjson.
+    """
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys).encode()
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode()
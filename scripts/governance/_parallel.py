@@ -0,0 +1,31 @@
+"""
+Shared per-file fan-out for governance scanners.
+Small batches run serially — process pool startup costs more than it saves.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MIN_PARALLEL_FILES = 16
+# More workers than this just contend for the scheduler and file handles
+MAX_WORKERS = 32
+
+
+def default_jobs():
+    return min(MAX_WORKERS, os.cpu_count() or 1)
+
+
+def map_files(func, files, min_parallel=MIN_PARALLEL_FILES, chunksize=None, jobs=None):
+    """Apply a module-level func to each file, in order, across CPU cores.
+
+    jobs caps the worker count (default: min(32, cpu_count)); jobs=1 runs
+    serially for debugging. chunksize defaults to ~4 chunks per worker.
+    """
+    files = list(files)
+    jobs = jobs or default_jobs()
+    if jobs == 1 or len(files) < min_parallel:
+        return [func(f) for f in files]
+    if chunksize is None:
+        chunksize = max(1, len(files) // (4 * jobs))
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        return list(ex.map(func, files, chunksize=chunksize))
@@ -0,0 +1,31 @@
+"""
+Batched file reads for governance scanners.
+Many small files make reading latency-bound: one open/read/close after
+another. A thread pool keeps several reads in flight (file I/O releases
+the GIL), so cold-cache reads overlap instead of queueing.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+READ_WORKERS = 16
+# Below this many files the pool costs more than it overlaps
+MIN_BATCH = 8
+
+
+def _read(path):
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def read_all(paths, workers=READ_WORKERS):
+    """{path: bytes} for every readable path; unreadable paths are left out."""
+    paths = list(paths)
+    if len(paths) < MIN_BATCH:
+        blobs = map(_read, paths)
+        return {p: data for p, data in zip(paths, blobs, strict=True) if data is not None}
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        blobs = ex.map(_read, paths)
+        return {p: data for p, data in zip(paths, blobs, strict=True) if data is not None}
@@ -0,0 +1,151 @@
+"""
+Shared single-pass source analyser for the metrics and guardrails scripts.
+One tokenize pass over a file's bytes yields its code-line bitmap (for LOC)
+and the suppression/Any markers, so neither script re-reads, decodes or
+regex-scans the text separately. Markers are taken from COMMENT tokens and
+annotation tokens only, so occurrences inside string literals do not count.
+"""
+
+import io
+import keyword
+import mmap
+import tokenize
+
+# Suppression markers, matched inside COMMENT tokens
+COMMENT_MARKERS = {
+    "type_ignores": "# type: ignore",
+    "noqa_comments": "# noqa",
+    "pylint_disables": "# pylint: disable",
+}
+# Every marker count analyze() reports, in reporting order
+MARKER_KEYS = ("type_ignores", "any_annotations", "noqa_comments", "pylint_disables")
+
+# Tokens that never make a line count as code
+NON_CODE_TOKENS = frozenset(
+    {
+        tokenize.COMMENT,
+        tokenize.NL,
+        tokenize.ENCODING,
+        tokenize.INDENT,
+        tokenize.DEDENT,
+        tokenize.ENDMARKER,
+    }
+)
+
+
+class _Annotations:
+    """Spots `: Any` annotations in one logical line's token stream.
+
+    A `:` opens an annotation when it sits directly inside a def's parameter
+    list, or at bracket depth 0 in a statement led by a plain name (x: T,
+    self.x: T). Dict displays, slices, lambdas and compound-statement
+    headers (if/for/with/...: ) are not annotations.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.depth = 0
+        self.plain_stmt = None  # unknown until the statement's first token
+        self.want_def_paren = False
+        self.def_depth = None
+        self.lambda_depths = []
+        self.after_colon = False
+
+    def feed(self, tok):
+        """Consume one code token; True if it is `Any` right after an annotation colon."""
+        hit = self.after_colon and tok.type == tokenize.NAME and tok.string == "Any"
+        self.after_colon = False
+        if self.plain_stmt is None:
+            self.plain_stmt = tok.type == tokenize.NAME and not keyword.iskeyword(tok.string)
+        if tok.type == tokenize.NAME:
+            if tok.string == "def":
+                self.want_def_paren = True
+            elif tok.string == "lambda":
+                self.lambda_depths.append(self.depth)
+        elif tok.type == tokenize.OP:
+            op = tok.string
+            if op in "([{":
+                self.depth += 1
+                if op == "(" and self.want_def_paren:
+                    self.def_depth, self.want_def_paren = self.depth, False
+            elif op in ")]}":
+                if self.depth == self.def_depth:
+                    self.def_depth = None
+                self.depth = max(0, self.depth - 1)
+            elif op == ":":
+                if self.lambda_depths and self.lambda_depths[-1] == self.depth:
+                    self.lambda_depths.pop()
+                elif self.depth == self.def_depth or (self.depth == 0 and self.plain_stmt):
+                    self.after_colon = True
+            elif op == ";" and self.depth == 0:
+                self.reset()
+        return hit
+
+
+def _ensure(code, line):
+    if line >= len(code):
+        code.extend(bytes(line + 1 - len(code)))
+
+
+def _fallback(data, result):
+    # Untokenizable source: non-blank, non-comment lines and raw marker counts
+    code = result["code"]
+    for i, line in enumerate(data.splitlines(), 1):
+        stripped = line.strip()
+        if stripped and not stripped.startswith(b"#"):
+            _ensure(code, i)
+            code[i] = 1
+    for key, marker in COMMENT_MARKERS.items():
+        result[key] = data.count(marker.encode())
+    result["any_annotations"] = data.count(b": Any")
+    return result
+
+
+def analyze(data) -> dict:
+    """Code-line bitmap, LOC and marker counts for one file's bytes (or mmap).
+
+    "code" is a bytearray indexed by line number (1 = the line holds code:
+    not blank, not a comment, not a standalone string such as a docstring).
+    "loc" is its popcount; the MARKER_KEYS entries are counts.
+    """
+    if isinstance(data, mmap.mmap):
+        data.seek(0)
+        readline = data.readline
+    else:
+        readline = io.BytesIO(data).readline
+    result = {"code": bytearray(), **dict.fromkeys(MARKER_KEYS, 0)}
+    code = result["code"]
+    stmt_start = True
+    pending = []  # string tokens opening a statement; dropped if the statement is only strings
+    ann = _Annotations()
+    try:
+        for tok in tokenize.tokenize(readline):
+            if tok.type == tokenize.COMMENT:
+                for key, marker in COMMENT_MARKERS.items():
+                    result[key] += tok.string.count(marker)
+                continue
+            if tok.type == tokenize.NEWLINE:
+                pending = []
+                stmt_start = True
+                ann.reset()
+                continue
+            if tok.type in NON_CODE_TOKENS:
+                continue
+            if ann.feed(tok):
+                result["any_annotations"] += 1
+            if tok.type == tokenize.STRING and (stmt_start or pending):
+                pending.append(tok)
+                stmt_start = False
+                continue
+            for t in (*pending, tok):
+                _ensure(code, t.end[0])
+                code[t.start[0] : t.end[0] + 1] = b"\1" * (t.end[0] - t.start[0] + 1)
+            pending = []
+            stmt_start = False
+    except (tokenize.TokenError, SyntaxError):
+        result = {"code": bytearray(), **dict.fromkeys(MARKER_KEYS, 0)}
+        _fallback(data[:], result)
+    result["loc"] = result["code"].count(1)
+    return result
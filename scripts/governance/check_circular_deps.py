@@ -8,9 +8,13 @@ Usage:
     python check_circular_deps.py       # Full scan
 """
 
+import importlib.util
+import subprocess
 import sys
+from collections import deque
 from pathlib import Path
-from subprocess import run
+
+from _fs import iter_py
 
 # ADAPT: Project root and source package
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -19,7 +23,13 @@ SRC_PACKAGE = "src"  # ADAPT: Your Python package name
 
 def check_with_import_linter():
     """Use import-linter if available."""
-    result = run(["lint-imports"], capture_output=True, text=True, cwd=str(PROJECT_ROOT))
+    try:
+        result = subprocess.run(
+            ["lint-imports"], capture_output=True, text=True, cwd=str(PROJECT_ROOT)
+        )
+    except OSError:
+        # Library importable but CLI missing from PATH
+        return check_with_ast_fallback()
     if result.returncode != 0:
         print("BLOCKED: Circular import dependencies detected\n")
         print(result.stdout)
@@ -30,6 +40,68 @@ def check_with_import_linter():
     return 0
 
 
+def strongly_connected_components(graph):
+    """Iterative Tarjan: return SCCs that contain a cycle (size > 1 or a self-import)."""
+    index, lowlink = {}, {}
+    stack, on_stack = [], set()
+    components = []
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, deps = work[-1]
+            dep = next(deps, None)
+            if dep is not None:
+                if dep not in index:
+                    index[dep] = lowlink[dep] = len(index)
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    work.append((dep, iter(graph.get(dep, ()))))
+                elif dep in on_stack:
+                    lowlink[node] = min(lowlink[node], index[dep])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in graph.get(node, ()):
+                    components.append(component)
+    return components
+
+
+def witness_cycle(component, graph):
+    """Shortest import cycle through the component's first module (BFS inside the SCC)."""
+    members = set(component)
+    start = min(component)
+    parent = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for dep in graph.get(node, ()):
+            if dep == start:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return path[::-1] + [start]
+            if dep in members and dep not in parent:
+                parent[dep] = node
+                queue.append(dep)
+    return [start, start]
+
+
 def check_with_ast_fallback():
     """AST-based fallback for circular import detection."""
     import ast
@@ -41,7 +113,8 @@ def check_with_ast_fallback():
 
     # Build import graph
     graph = {}
-    for py in src_dir.rglob("*.py"):
+    for entry in iter_py(src_dir):
+        py = Path(entry.path)
         mod = str(py.relative_to(PROJECT_ROOT)).replace("/", ".").replace("\\", ".")[:-3]
         imports = set()
         try:
@@ -54,45 +127,30 @@ def check_with_ast_fallback():
                         imports.add(alias.name)
         except (OSError, SyntaxError):
             pass
-        graph[mod] = {i for i in imports if i.startswith(SRC_PACKAGE + ".")}
-
-    # Detect cycles via DFS
-    cycles = []
-    visited, rec_stack = set(), set()
-
-    def dfs(node, path):
-        visited.add(node)
-        rec_stack.add(node)
-        for dep in graph.get(node, []):
-            if dep in rec_stack:
-                cycle = path[path.index(dep) :] + [dep]
-                cycles.append(cycle)
-            elif dep not in visited:
-                dfs(dep, path + [dep])
-        rec_stack.discard(node)
-
-    for mod in graph:
-        if mod not in visited:
-            dfs(mod, [mod])
-
-    if cycles:
-        print(f"BLOCKED: {len(cycles)} circular import cycle(s) detected\n")
-        for cycle in cycles[:5]:
-            print(f"  {' -> '.join(cycle)}")
+        graph[mod] = sorted(i for i in imports if i.startswith(SRC_PACKAGE + "."))
+
+    # Each strongly connected component is one cycle family, reported once
+    components = strongly_connected_components(graph)
+
+    if components:
+        print(f"BLOCKED: {len(components)} circular import cycle(s) detected\n")
+        for component in sorted(components, key=len, reverse=True)[:5]:
+            cycle = witness_cycle(component, graph)
+            extra = len(component) - (len(cycle) - 1)
+            suffix = f" (+{extra} more module(s) in this cycle group)" if extra else ""
+            print(f"  {' -> '.join(cycle)}{suffix}")
         return 1
 
     print("Circular Dependency Check PASSED")
     return 0
 
 
-def main():
-    # Try import-linter first, fall back to AST
-    try:
-        run(["lint-imports", "--version"], capture_output=True, check=True)
-        sys.exit(check_with_import_linter())
-    except (FileNotFoundError, Exception):
-        sys.exit(check_with_ast_fallback())
+def run():
+    # Try import-linter first (spec lookup, no subprocess probe), fall back to AST
+    if importlib.util.find_spec("importlinter") is not None:
+        return check_with_import_linter()
+    return check_with_ast_fallback()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
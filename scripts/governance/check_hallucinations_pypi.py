@@ -9,19 +9,36 @@ Usage:
     python check_hallucinations_pypi.py --verbose      # Detailed output
 """
 
+import asyncio
 import json
+import re
 import sys
 import urllib.error
 import urllib.request
 from datetime import UTC, datetime
 from pathlib import Path
 
+from _jsonio import dumps, loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # ADAPT: Project root and requirements file
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 REQ_FILE = PROJECT_ROOT / "requirements.txt"
 CACHE_FILE = PROJECT_ROOT / ".supply-chain-cache-pypi.json"
 EXEMPTIONS_FILE = PROJECT_ROOT / ".supply-chain-exemptions.json"
 MIN_DAYS_OLD = 30
+# PEP 691 JSON simple index — lighter than /pypi/<pkg>/json, still carries upload times
+PYPI_SIMPLE_URL = "https://pypi.org/simple/{}/"
+PYPI_SIMPLE_ACCEPT = "application/vnd.pypi.simple.v1+json"
+MAX_CONCURRENT_REQUESTS = 16
+# Index pages at least this large are streamed with ijson (when installed)
+STREAM_MIN_BYTES = 64 * 1024
+# Version specifier or extras start — everything before it is the package name
+SPEC_RE = re.compile(r"[><=!~]=?|\[")
 
 # ADAPT: Packages you trust regardless of age/downloads
 TRUSTED_PACKAGES = {
@@ -47,7 +64,7 @@ TRUSTED_PACKAGES = {
 def load_cache():
     if CACHE_FILE.exists():
         try:
-            data = json.loads(CACHE_FILE.read_text())
+            data = loads(CACHE_FILE.read_bytes())
             if data.get("timestamp", 0) > datetime.now(UTC).timestamp() - 86400:
                 return data.get("packages", {})
         except (json.JSONDecodeError, OSError):
@@ -56,8 +73,8 @@ def load_cache():
 
 
 def save_cache(packages):
-    CACHE_FILE.write_text(
-        json.dumps({"timestamp": datetime.now(UTC).timestamp(), "packages": packages}, indent=2)
+    CACHE_FILE.write_bytes(
+        dumps({"timestamp": datetime.now(UTC).timestamp(), "packages": packages})
     )
 
 
@@ -70,28 +87,59 @@ def load_exemptions():
     return set()
 
 
+def _parse_upload(upload):
+    try:
+        return datetime.fromisoformat(upload.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _earliest(first, upload):
+    dt = _parse_upload(upload) if upload else None
+    if dt is not None and (first is None or dt < first):
+        return dt
+    return first
+
+
+def read_index(resp):
+    """Return (name, earliest upload) from a simple-index response.
+
+    Mature packages list every artifact ever uploaded; large pages are
+    streamed so only the running minimum is held in memory. PyPI sends
+    "name" after "files", so a streamed read returns name None and the
+    caller falls back to the name it requested.
+    """
+    length = int(resp.headers.get("Content-Length") or 0)
+    if ijson is None or 0 < length < STREAM_MIN_BYTES:
+        data = json.loads(resp.read())
+        first_release = None
+        for f in data.get("files", []):
+            first_release = _earliest(first_release, f.get("upload-time"))
+        return data.get("name"), first_release
+    name = None
+    first_release = None
+    for prefix, event, value in ijson.parse(resp):
+        if prefix == "name" and event == "string":
+            name = value
+        elif prefix == "files.item.upload-time" and event == "string":
+            first_release = _earliest(first_release, value)
+        elif prefix == "files" and event == "end_array":
+            # Nothing after the files array is needed (meta, name, versions)
+            break
+    return name, first_release
+
+
 def check_pypi(package_name):
     """Check if package exists on PyPI and is trustworthy."""
-    url = f"https://pypi.org/pypi/{package_name}/json"
+    request = urllib.request.Request(
+        PYPI_SIMPLE_URL.format(package_name), headers={"Accept": PYPI_SIMPLE_ACCEPT}
+    )
     try:
-        with urllib.request.urlopen(url, timeout=10) as resp:
-            data = json.loads(resp.read())
-        info = data.get("info", {})
-        releases = data.get("releases", {})
+        with urllib.request.urlopen(request, timeout=10) as resp:
+            name, first_release = read_index(resp)
         # Check age
-        first_release = None
-        for version_files in releases.values():
-            for f in version_files:
-                upload = f.get("upload_time_iso_8601") or f.get("upload_time")
-                if upload:
-                    try:
-                        dt = datetime.fromisoformat(upload.replace("Z", "+00:00"))
-                        if first_release is None or dt < first_release:
-                            first_release = dt
-                    except ValueError:
-                        pass
         age_days = (datetime.now(UTC) - first_release).days if first_release else 999
-        return {"exists": True, "age_days": age_days, "name": info.get("name", package_name)}
+        return {"exists": True, "age_days": age_days, "name": name or package_name}
     except urllib.error.HTTPError as e:
         if e.code == 404:
             return {"exists": False, "age_days": 0, "name": package_name}
@@ -100,6 +148,24 @@ def check_pypi(package_name):
         return {"exists": True, "age_days": 999, "name": package_name}
 
 
+async def _check_pypi_bounded(package_name, semaphore):
+    async with semaphore:
+        return package_name, await asyncio.to_thread(check_pypi, package_name)
+
+
+async def _check_pypi_all(package_names):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    results = await asyncio.gather(*(_check_pypi_bounded(p, semaphore) for p in package_names))
+    return dict(results)
+
+
+def check_pypi_many(package_names):
+    """Check packages concurrently — wall time ~ slowest request, not the sum."""
+    if not package_names:
+        return {}
+    return asyncio.run(_check_pypi_all(package_names))
+
+
 def parse_requirements():
     """Parse package names from requirements.txt."""
     if not REQ_FILE.exists():
@@ -109,34 +175,29 @@ def parse_requirements():
         line = line.strip()
         if not line or line.startswith("#") or line.startswith("-"):
             continue
-        # Strip version specifiers
-        for sep in [">=", "<=", "==", "!=", "~=", "<", ">"]:
-            line = line.split(sep)[0]
-        line = line.split("[")[0].strip()
+        # Strip version specifiers and extras
+        line = SPEC_RE.split(line, maxsplit=1)[0].strip()
         if line:
             packages.append(line.lower())
     return packages
 
 
-def main():
+def run():
     packages = parse_requirements()
     if not packages:
         print("Supply Chain (PyPI): No packages to check.")
-        sys.exit(0)
+        return 0
 
     cache = load_cache()
     exemptions = load_exemptions()
     blocked = []
 
-    for pkg in packages:
-        if pkg in TRUSTED_PACKAGES or pkg in exemptions:
-            continue
-        if pkg in cache:
-            info = cache[pkg]
-        else:
-            info = check_pypi(pkg)
-            cache[pkg] = info
+    to_check = [p for p in packages if p not in TRUSTED_PACKAGES and p not in exemptions]
+    uncached = [p for p in dict.fromkeys(to_check) if p not in cache]
+    cache.update(check_pypi_many(uncached))
 
+    for pkg in to_check:
+        info = cache[pkg]
         if not info["exists"]:
             blocked.append((pkg, "Package does NOT exist on PyPI — likely hallucinated"))
         elif info["age_days"] < MIN_DAYS_OLD:
@@ -153,11 +214,11 @@ def main():
         print(
             "\nFix: Verify the correct package name. Add to .supply-chain-exemptions.json if legitimate."
         )
-        sys.exit(1)
+        return 1
 
     print(f"Supply Chain (PyPI) PASSED — {len(packages)} package(s) checked")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
@@ -11,6 +11,8 @@ Pattern: src/services/foo_service.py -> tests/integration/test_foo_service.py
 import sys
 from pathlib import Path
 
+from _fs import iter_py
+
 
 def check_integration_pairing() -> int:
     print("=== Layer 7: Integration Test Pairing ===")
@@ -22,16 +24,22 @@ def check_integration_pairing() -> int:
         print("PASS: No services/ directory (nothing to check)")
         return 0
 
-    service_files = list(services_dir.rglob("*_service.py"))
+    service_files = [
+        Path(entry.path) for entry in iter_py(services_dir) if entry.name.endswith("_service.py")
+    ]
     if not service_files:
         print("PASS: No service files found")
         return 0
 
+    existing = (
+        {p.name for p in integration_dir.glob("test_*.py")} if integration_dir.exists() else set()
+    )
+
     violations = 0
     for service_file in service_files:
         stem = service_file.stem  # e.g., "user_service"
         expected_test = integration_dir / f"test_{stem}.py"
-        if not expected_test.exists():
+        if expected_test.name not in existing:
             print(f"  WARN: {service_file} has no integration test at {expected_test}")
             # Warn only — don't block (new services should get tests soon)
         else:
@@ -45,5 +53,9 @@ def check_integration_pairing() -> int:
     return 0
 
 
+def run() -> int:
+    return check_integration_pairing()
+
+
 if __name__ == "__main__":
-    sys.exit(check_integration_pairing())
+    sys.exit(run())
@@ -17,44 +17,80 @@ Also scans for adversarial mocking patterns (--scan-only mode).
 from __future__ import annotations
 
 import argparse
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-MOCK_PATTERNS = [
+from _fs import iter_py
+from _parallel import map_files
+
+MOCK_PATTERNS = (
     "mock.patch",
     "patch(",
     "MagicMock(",
     "Mock(",
     "mocker.patch",
     "monkeypatch.setattr",
-]
+)
+
+# Lookahead alternation so overlapping patterns ("MagicMock(" / "Mock(") are each
+# counted, matching a per-pattern str.count() sum in a single scan.
+MOCK_RE = re.compile("(?=(?:" + "|".join(re.escape(p) for p in MOCK_PATTERNS) + "))")
 
-ADVERSARIAL_PATTERNS = [
+ADVERSARIAL_PATTERNS = (
     "mock.patch.object",
     "patch.object(",
-]
+)
 
 
-def count_lines(path: Path) -> int:
-    """Count non-empty, non-comment lines."""
+# (path, mtime_ns, size) -> (loc, mock_count); reused across calls in one process
+_SCAN_CACHE: dict[tuple[str, int, int], tuple[int, int]] = {}
+
+
+def scan_test_file(path: Path) -> tuple[int, int]:
+    """Count non-empty, non-comment lines and mock usages in a single pass."""
     try:
-        lines = path.read_text().splitlines()
-        return sum(1 for line in lines if line.strip() and not line.strip().startswith("#"))
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        if key not in _SCAN_CACHE:
+            loc, mocks = 0, 0
+            with open(path) as fh:
+                for line in fh:
+                    stripped = line.strip()
+                    if stripped and not stripped.startswith("#"):
+                        loc += 1
+                    mocks += len(MOCK_RE.findall(line))
+            _SCAN_CACHE[key] = (loc, mocks)
+        return _SCAN_CACHE[key]
     except Exception:
-        return 0
+        return 0, 0
+
+
+def count_lines(path: Path) -> int:
+    """Count non-empty, non-comment lines."""
+    return scan_test_file(path)[0]
 
 
 def count_mock_calls(path: Path) -> int:
     """Count mock usage in a test file."""
-    content = path.read_text()
-    return sum(content.count(pattern) for pattern in MOCK_PATTERNS)
+    return scan_test_file(path)[1]
+
+
+@lru_cache(maxsize=1)
+def src_index() -> dict[str, list[Path]]:
+    """Map module stem -> source files, built with a single walk of src/."""
+    index: dict[str, list[Path]] = {}
+    for entry in iter_py("src"):
+        index.setdefault(entry.name[:-3], []).append(Path(entry.path))
+    return index
 
 
 def find_source_file(test_file: Path) -> Path | None:
     """Find the source file corresponding to a test file."""
     # test_foo.py -> src/foo.py or src/**/foo.py
     stem = test_file.stem.removeprefix("test_").removesuffix("_test")
-    candidates = list(Path("src").rglob(f"{stem}.py")) if Path("src").exists() else []
+    candidates = src_index().get(stem)
     return candidates[0] if candidates else None
 
 
@@ -81,13 +117,18 @@ def check_mock_tax(scan_only: bool = False) -> int:
         return 0
 
     print("=== Layer 2: Rising Tide (Mock Tax — 2x Rule) ===")
+    sources = {test_file: find_source_file(test_file) for test_file in test_files}
+    to_scan = list(dict.fromkeys([*test_files, *filter(None, sources.values())]))
+    scans = map_files(scan_test_file, to_scan)
+    loc = {path: scan[0] for path, scan in zip(to_scan, scans, strict=True)}
+
     for test_file in test_files:
-        source_file = find_source_file(test_file)
+        source_file = sources[test_file]
         if not source_file:
             continue  # Can't compare without source file
 
-        test_loc = count_lines(test_file)
-        src_loc = count_lines(source_file)
+        test_loc = loc[test_file]
+        src_loc = loc[source_file]
 
         if src_loc == 0:
             continue
@@ -113,10 +154,14 @@ def check_mock_tax(scan_only: bool = False) -> int:
     return 0
 
 
-if __name__ == "__main__":
+def run() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--scan-only", action="store_true", help="Only scan for adversarial patterns"
     )
     args = parser.parse_args()
-    sys.exit(check_mock_tax(scan_only=args.scan_only))
+    return check_mock_tax(scan_only=args.scan_only)
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -17,9 +17,13 @@ Prerequisites:
 import argparse
 import json
 import os
+import sqlite3
+import subprocess
 import sys
 from pathlib import Path
-from subprocess import run
+
+from _git import changed_files
+from _jsonio import loads
 
 # ADAPT: Project root and source directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -33,29 +37,27 @@ DEFAULT_AMNESTY = {
     "generated": ["src/generated/"],
 }
 
+# mutmut 2.x records every mutant's status in this SQLite cache; `mutmut
+# results` only lists mutant ids under status headings, with no counts
+MUTMUT_CACHE = PROJECT_ROOT / ".mutmut-cache"
+KILLED_STATUS = "ok_killed"
+# Statuses of mutants the test suite actually ran against (not untested/skipped)
+TESTED_STATUSES = ("ok_killed", "ok_suspicious", "bad_timeout", "bad_survived")
+
 
 def get_changed_files():
-    try:
-        base = os.environ.get("GITHUB_BASE_REF", "main")
-        result = run(
-            ["git", "diff", "--name-only", "--diff-filter=ACM", f"origin/{base}...HEAD"],
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
-        )
-        return [
-            f
-            for f in result.stdout.strip().split("\n")
-            if f.endswith(".py") and f.startswith("src/") and not f.endswith("__init__.py")
-        ]
-    except Exception:
-        return []
+    base = os.environ.get("GITHUB_BASE_REF", "main")
+    return [
+        f
+        for f in changed_files(base)
+        if f.endswith(".py") and f.startswith("src/") and not f.endswith("__init__.py")
+    ]
 
 
 def load_amnesty():
     if AMNESTY_FILE.exists():
         try:
-            return json.loads(AMNESTY_FILE.read_text())
+            return loads(AMNESTY_FILE.read_bytes())
         except (json.JSONDecodeError, OSError):
             pass
     return DEFAULT_AMNESTY
@@ -69,44 +71,53 @@ def is_exempt(file_path, amnesty):
     return False
 
 
+def mutant_counts(files):
+    """{status: count} of the mutants in files per .mutmut-cache, or None if it cannot be read."""
+    query = (
+        "SELECT f.filename, m.status, COUNT(*) FROM Mutant m"
+        " JOIN Line l ON m.line = l.id JOIN SourceFile f ON l.sourcefile = f.id"
+        " GROUP BY f.filename, m.status"
+    )
+    wanted = {f.replace("\\", "/") for f in files}
+    counts = {}
+    try:
+        with sqlite3.connect(f"file:{MUTMUT_CACHE}?mode=ro", uri=True) as conn:
+            for filename, status, n in conn.execute(query):
+                if filename.replace("\\", "/") in wanted:
+                    counts[status] = counts.get(status, 0) + n
+    except sqlite3.Error:
+        return None
+    return counts
+
+
 def run_mutmut(files, threshold):
     """Run mutmut on specific files and check score."""
     if not files:
         print("Mutation Testing: No files to test.")
         return 0
 
-    # Run mutmut for each file
-    total_mutants, total_killed = 0, 0
-    for f in files:
-        result = run(
-            ["mutmut", "run", "--paths-to-mutate", f, "--no-progress"],
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
-        )
-        # Parse results
-        result_check = run(
-            ["mutmut", "results"], capture_output=True, text=True, cwd=str(PROJECT_ROOT)
-        )
-        output = result_check.stdout
-        # Extract killed/survived counts
-        for line in output.splitlines():
-            if "killed" in line.lower():
-                parts = line.split()
-                for i, p in enumerate(parts):
-                    if p.isdigit():
-                        total_killed += int(p)
-                        break
-            if "survived" in line.lower() or "total" in line.lower():
-                parts = line.split()
-                for p in parts:
-                    if p.isdigit():
-                        total_mutants += int(p)
-                        break
-
-    if total_mutants == 0:
+    # Single batched run — one pytest collection for all changed files
+    subprocess.run(
+        ["mutmut", "run", "--paths-to-mutate", ",".join(files), "--no-progress"],
+        capture_output=True,
+        text=True,
+        cwd=str(PROJECT_ROOT),
+    )
+    counts = mutant_counts(files)
+    if counts is None:
+        print(f"\nBLOCKED: could not read mutant statuses from {MUTMUT_CACHE.name}")
+        print("Fix: Check that `mutmut run` completed (run it manually to see its output).")
+        return 1
+    if not counts:
         print("Mutation Testing: No mutants generated.")
         return 0
+    total_killed = counts.get(KILLED_STATUS, 0)
+    total_mutants = sum(counts.get(status, 0) for status in TESTED_STATUSES)
+    if total_mutants == 0:
+        # Mutants exist but none was tested: mutmut stopped early (e.g. failing baseline)
+        print(f"\nBLOCKED: {sum(counts.values())} mutant(s) generated but none tested")
+        print("Fix: Run `mutmut run` manually and fix the error it reports.")
+        return 1
 
     score = (total_killed / total_mutants) * 100
     print(f"Mutation Testing: {score:.1f}% ({total_killed}/{total_mutants} killed)")
@@ -120,7 +131,7 @@ def run_mutmut(files, threshold):
     return 0
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="Mutation Testing Gate")
     parser.add_argument("--changed-files", nargs="*", default=None)
     parser.add_argument("--threshold", type=int, default=MUTATION_THRESHOLD)
@@ -132,11 +143,11 @@ def main():
 
     if not files:
         print("Mutation Testing: No non-exempt files changed.")
-        sys.exit(0)
+        return 0
 
     print(f"Mutation Testing — {len(files)} file(s), threshold {args.threshold}%")
-    sys.exit(run_mutmut(files, args.threshold))
+    return run_mutmut(files, args.threshold)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
@@ -8,78 +8,130 @@ Usage:
     python check_noqa.py  # Checks changed files (CI or pre-commit)
 """
 
+import hashlib
+import mmap
+import os
+import re
 import sys
 from pathlib import Path
-from subprocess import run
+
+from _fs import MMAP_MIN_BYTES
+from _git import ci_changed_files
+from _jsonio import dumps, loads
+from _parallel import map_files
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# sha1(pattern salt + path, mtime_ns, size) -> [[line, text, message], ...], keyed
+# like _filecache: files whose stat is unchanged skip the scan
+CACHE_FILE = PROJECT_ROOT / ".memory-layer" / "cache" / "noqa.json"
+CACHE_MAX_ENTRIES = 4096
 
 # ADAPT: Paths exempt from this rule (test infrastructure, scripts)
-EXEMPT_PATHS = ["tests/mocks/", "scripts/", "conftest.py"]
+EXEMPT_PATHS = ("tests/mocks/", "scripts/", "conftest.py")
+EXEMPT_RE = re.compile("|".join(re.escape(e) for e in EXEMPT_PATHS))
 
-FORBIDDEN_PATTERNS = [
+FORBIDDEN_PATTERNS = (
     ("# noqa", "noqa suppression"),
     ("# type: ignore", "type: ignore suppression"),
     ("# pylint: disable", "pylint disable"),
     ("# pylint:disable", "pylint disable"),
-]
+)
+FORBIDDEN_BYTES = tuple((pattern.encode(), message) for pattern, message in FORBIDDEN_PATTERNS)
+LEGACY_MARKER = b"-- LEGACY"
+# Folded into cache keys so editing the patterns invalidates old results
+CACHE_SALT = repr(FORBIDDEN_PATTERNS).encode()
 
 
 def is_exempt(file_path):
-    return any(e in file_path for e in EXEMPT_PATHS)
+    return EXEMPT_RE.search(file_path) is not None
 
 
 def get_changed_files():
-    import os
+    return [f for f in ci_changed_files() if f.endswith(".py") and not is_exempt(f)]
 
-    try:
-        if os.environ.get("CI") == "true":
-            base = os.environ.get("GITHUB_BASE_REF", "main")
-            result = run(
-                ["git", "diff", "--name-only", "--diff-filter=ACM", f"origin/{base}...HEAD"],
-                capture_output=True,
-                text=True,
-            )
-        else:
-            result = run(
-                ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"],
-                capture_output=True,
-                text=True,
-            )
-        return [
-            f for f in result.stdout.strip().split("\n") if f.endswith(".py") and not is_exempt(f)
-        ]
-    except Exception:
+
+def _scan_buffer(buf, file_path):
+    """Scan a bytes-like buffer (bytes or mmap) line by line without splitting it."""
+    if all(buf.find(pattern) == -1 for pattern, _ in FORBIDDEN_BYTES):
         return []
+    violations = []
+    pos, lineno, size = 0, 0, len(buf)
+    while pos < size:
+        end = buf.find(b"\n", pos)
+        if end == -1:
+            end = size
+        lineno += 1
+        if buf.find(LEGACY_MARKER, pos, end) == -1:
+            for pattern, message in FORBIDDEN_BYTES:
+                if buf.find(pattern, pos, end) != -1:
+                    text = buf[pos:end].decode("utf-8", errors="replace").strip()
+                    violations.append(
+                        {"file": file_path, "line": lineno, "text": text, "message": message}
+                    )
+                    break
+        pos = end + 1
+    return violations
 
 
 def check_file(file_path):
-    if not Path(file_path).exists():
+    path = Path(file_path)
+    if not path.exists():
         return []
-    violations = []
-    for i, line in enumerate(Path(file_path).read_text().splitlines(), 1):
-        if "-- LEGACY" in line:
-            continue
-        for pattern, message in FORBIDDEN_PATTERNS:
-            if pattern in line:
-                violations.append(
-                    {"file": file_path, "line": i, "text": line.strip(), "message": message}
-                )
-                break
-    return violations
+    if path.stat().st_size < MMAP_MIN_BYTES:
+        return _scan_buffer(path.read_bytes(), file_path)
+    # Large files: let the kernel page in on demand instead of copying into a str
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _scan_buffer(mm, file_path)
 
 
-def main():
+def _cache_key(file_path):
+    """Key from (path, mtime_ns, size), like _filecache: a hit costs a stat, not a read."""
+    st = os.stat(file_path)
+    stamp = f"{os.path.abspath(file_path)}\0{st.st_mtime_ns}\0{st.st_size}".encode()
+    return hashlib.sha1(CACHE_SALT + stamp).hexdigest()
+
+
+def load_cache():
+    try:
+        return loads(CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    # Oldest-first insertion order doubles as LRU order
+    entries = list(cache.items())[-CACHE_MAX_ENTRIES:]
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_FILE.write_bytes(dumps(dict(entries)))
+
+
+def run():
     changed = get_changed_files()
     if not changed:
         print("noqa Gate: No files changed.")
-        sys.exit(0)
+        return 0
+
+    cache = load_cache()
+    keys = {f: _cache_key(f) for f in changed if Path(f).exists()}
+    misses = [f for f, key in keys.items() if key not in cache]
+    for f, found in zip(misses, map_files(check_file, misses), strict=True):
+        cache[keys[f]] = [[v["line"], v["text"], v["message"]] for v in found]
 
     violations = []
-    for f in changed:
-        violations.extend(check_file(f))
+    for f, key in keys.items():
+        if misses:
+            cache[key] = cache.pop(key)  # mark as recently used
+        violations.extend(
+            {"file": f, "line": line, "text": text, "message": message}
+            for line, text, message in cache[key]
+        )
+    # All hits: nothing new to store, so skip the rewrite (recency updates only on writes)
+    if misses:
+        save_cache(cache)
 
     if not violations:
         print("noqa Gate: Passed.")
-        sys.exit(0)
+        return 0
 
     print("BLOCKED: Suppression directives found in new code\n")
     for v in violations:
@@ -87,8 +139,8 @@ def main():
         print(f"    {v['text']}\n")
     print("Fix: Resolve the underlying issue instead of suppressing it.")
     print('Legacy: Add "-- LEGACY" suffix for pre-existing suppressions.\n')
-    sys.exit(1)
+    return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
@@ -27,6 +27,7 @@ BOUNDARY_PATTERNS = [
 ]
 # ADAPT: Patterns that indicate Pydantic validation
 PYDANTIC_PATTERNS = ["BaseModel", "pydantic", "Field(", "validator", "model_validate"]
+PYDANTIC_BYTES = tuple(p.encode() for p in PYDANTIC_PATTERNS)
 
 
 def is_boundary_file(file_path):
@@ -36,21 +37,21 @@ def is_boundary_file(file_path):
 
 def has_pydantic(file_path):
     try:
-        content = file_path.read_text(encoding="utf-8")
-        return any(p in content for p in PYDANTIC_PATTERNS)
-    except (OSError, UnicodeDecodeError):
+        data = file_path.read_bytes()
+    except OSError:
         return False
+    return any(p in data for p in PYDANTIC_BYTES)
 
 
-def main():
+def run():
     if not SRC_DIR.exists():
         print("Pydantic Boundaries: No source directory found.")
-        sys.exit(0)
+        return 0
 
     boundary_files = [f for f in SRC_DIR.rglob("*.py") if is_boundary_file(f)]
     if not boundary_files:
         print("Pydantic Boundaries: No boundary files found.")
-        sys.exit(0)
+        return 0
 
     missing = []
     for f in boundary_files:
@@ -66,11 +67,11 @@ def main():
             print(f"  {f}")
         print("\nFix: Add Pydantic BaseModel for request/response validation.")
         print("     from pydantic import BaseModel")
-        sys.exit(1)
+        return 1
 
     print(f"Pydantic Boundaries PASSED — {len(boundary_files)} boundary file(s) checked")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
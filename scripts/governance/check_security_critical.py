@@ -9,9 +9,11 @@ Usage:
 """
 
 import os
+import re
 import sys
 from pathlib import Path
-from subprocess import run
+
+from _git import ci_changed_files
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -33,53 +35,58 @@ SECURITY_PATTERNS = [
     "cors",
     "auth_required",
 ]
+MARKER_RE = re.compile("|".join(map(re.escape, SECURITY_MARKERS)))
+# Lookahead so overlapping patterns ("password" inside "hash_password") each match
+PATTERN_RE = re.compile("(?=(" + "|".join(map(re.escape, SECURITY_PATTERNS)) + "))", re.IGNORECASE)
 
 
 def get_changed_files():
-    try:
-        if os.environ.get("CI") == "true":
-            base = os.environ.get("GITHUB_BASE_REF", "main")
-            result = run(
-                ["git", "diff", "--name-only", "--diff-filter=ACM", f"origin/{base}...HEAD"],
-                capture_output=True,
-                text=True,
-            )
-        else:
-            result = run(
-                ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"],
-                capture_output=True,
-                text=True,
-            )
-        return [f for f in result.stdout.strip().split("\n") if f.endswith(".py")]
-    except Exception:
-        return []
+    return [f for f in ci_changed_files() if f.endswith(".py")]
+
+
+def _with_lineno(content, matches):
+    """Pair in-order matches with 1-based line numbers, counting newlines incrementally."""
+    lineno, last = 1, 0
+    for match in matches:
+        lineno += content.count("\n", last, match.start())
+        last = match.start()
+        yield lineno, match
 
 
 def check_file(file_path):
     if not Path(file_path).exists():
         return {"markers": [], "patterns": []}
     content = Path(file_path).read_text(encoding="utf-8")
-    lines = content.splitlines()
-    markers, patterns = [], []
-    for i, line in enumerate(lines, 1):
-        for m in SECURITY_MARKERS:
-            if m in line:
-                markers.append((i, line.strip()))
-        for p in SECURITY_PATTERNS:
-            if p in line.lower() and "test" not in file_path.lower():
-                patterns.append((i, p))
+    markers = []
+    seen = set()
+    for lineno, match in _with_lineno(content, MARKER_RE.finditer(content)):
+        pos = match.start()
+        if (lineno, match.group()) in seen:
+            continue
+        seen.add((lineno, match.group()))
+        start = content.rfind("\n", 0, pos) + 1
+        end = content.find("\n", pos)
+        markers.append((lineno, content[start : end if end != -1 else None].strip()))
+    patterns = []
+    if "test" not in file_path.lower():
+        seen = set()
+        for lineno, match in _with_lineno(content, PATTERN_RE.finditer(content)):
+            hit = (lineno, match.group(1).lower())
+            if hit not in seen:
+                seen.add(hit)
+                patterns.append(hit)
     return {"markers": markers, "patterns": patterns}
 
 
-def main():
+def run():
     if os.environ.get("SECURITY_REVIEW_ACKNOWLEDGED") == "true":
         print("Security Review: Acknowledged via environment variable.")
-        sys.exit(0)
+        return 0
 
     changed = get_changed_files()
     if not changed:
         print("Security Review: No changed files.")
-        sys.exit(0)
+        return 0
 
     critical_files = []
     for f in changed:
@@ -94,11 +101,11 @@ def main():
             for lineno, text in markers:
                 print(f"    Line {lineno}: {text}")
         print("\nOverride: Set SECURITY_REVIEW_ACKNOWLEDGED=true after human review.")
-        sys.exit(1)
+        return 1
 
     print(f"Security Review PASSED — {len(changed)} file(s) checked")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
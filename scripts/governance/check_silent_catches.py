@@ -11,20 +11,26 @@ Usage:
 
 import argparse
 import ast
+import re
 import sys
 from pathlib import Path
 
+from _ast_checks import analyze, run_checks
+from _git import list_tracked_py_files
+
 # ADAPT: Point to your project root and source directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SRC_DIR = PROJECT_ROOT / "src"
 SILENT_CATCH_MARKER = "SILENT_CATCH:"
+SILENT_CATCH_MARKER_BYTES = SILENT_CATCH_MARKER.encode()
 
 
 class SilentCatchVisitor(ast.NodeVisitor):
     """AST visitor to find silent exception handlers."""
 
-    def __init__(self, source_lines):
-        self.source_lines = source_lines
+    def __init__(self, source):
+        self.source = source
+        self._line_starts = None
         self.violations = []
 
     def visit_ExceptHandler(self, node):
@@ -72,37 +78,53 @@ class SilentCatchVisitor(ast.NodeVisitor):
             return True
         return False
 
+    def _line(self, idx):
+        """Return the 0-based line idx, indexing line offsets only on first use."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer(b"\n", self.source)]
+        if not 0 <= idx < len(self._line_starts):
+            return None
+        end = self._line_starts[idx + 1] if idx + 1 < len(self._line_starts) else len(self.source)
+        return self.source[self._line_starts[idx] : end]
+
     def _has_marker(self, lineno):
         for offset in [0, -1]:
-            idx = lineno + offset - 1
-            if 0 <= idx < len(self.source_lines):
-                if SILENT_CATCH_MARKER in self.source_lines[idx]:
-                    return True
+            line = self._line(lineno + offset - 1)
+            if line is not None and SILENT_CATCH_MARKER_BYTES in line:
+                return True
         return False
 
 
-def check_file(file_path):
-    try:
-        content = file_path.read_text(encoding="utf-8")
-        tree = ast.parse(content, filename=str(file_path))
-    except (OSError, SyntaxError):
+def needs_parse(data):
+    """No except clause, nothing to check — skip parsing."""
+    return data.find(b"except") != -1
+
+
+def analyze_source(file_path, data, tree):
+    if tree is None:
         return []
-    visitor = SilentCatchVisitor(content.splitlines())
+    # Marker lines are sliced straight from the (possibly mapped) bytes
+    visitor = SilentCatchVisitor(data)
     visitor.visit(tree)
     return visitor.violations
 
 
+def check_file(file_path):
+    return analyze(file_path, ("silent-catches",))["silent-catches"]
+
+
 def find_python_files(paths=None):
     if paths:
         return [Path(p) for p in paths if Path(p).exists() and Path(p).suffix == ".py"]
     files = []
     for d in [SRC_DIR, PROJECT_ROOT / "tests"]:
         if d.exists():
-            files.extend(d.rglob("*.py"))
+            tracked = list_tracked_py_files(d)
+            files.extend(d.rglob("*.py") if tracked is None else tracked)
     return files
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="Silent Catch Detection")
     parser.add_argument("--changed-files", nargs="*", default=None)
     args = parser.parse_args()
@@ -110,11 +132,10 @@ def main():
     files = find_python_files(args.changed_files)
     if not files:
         print("Silent Catch Check: No files found.")
-        sys.exit(0)
+        return 0
 
     all_violations = []
-    for f in files:
-        violations = check_file(f)
+    for f, violations in zip(files, run_checks("silent-catches", files), strict=True):
         for lineno, exc_type in violations:
             rel = str(f.relative_to(PROJECT_ROOT)).replace("\\", "/")
             all_violations.append((rel, lineno, exc_type))
@@ -127,11 +148,11 @@ def main():
         for path, lineno, exc_type in all_violations:
             print(f"  {path}:{lineno} — {exc_type}")
         print("\nFix: Add logging + re-raise, or mark: # SILENT_CATCH: reason")
-        sys.exit(1)
+        return 1
 
     print("  Dead Code Gate passed")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
@@ -19,7 +19,9 @@ import os
 import re
 import sys
 from pathlib import Path
-from subprocess import run
+
+from _ast_checks import analyze, run_checks
+from _git import ci_changed_files, list_tracked_py_files
 
 # ADAPT: Point to your project directories
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -44,6 +46,7 @@ EXCLUDE_DIRS = {
 
 # Test file patterns
 TEST_FILE_PATTERNS = [r"^test_.*\.py$", r".*_test\.py$"]
+TEST_FILE_RE = re.compile("|".join(TEST_FILE_PATTERNS))
 
 # Skip markers (searched in source)
 SKIP_PATTERNS = [
@@ -57,10 +60,13 @@ SKIP_PATTERNS = [
     r"self\.skipTest\s*\(",
     r"unittest\.skip\s*\(",
 ]
+# Lookahead alternation so overlapping patterns ("@unittest.skip(" matches two) are
+# each counted, matching a per-pattern findall() sum in a single scan.
+SKIP_RE = re.compile("(?=(?:" + "|".join(SKIP_PATTERNS) + "))")
 
 
 def is_test_file(filename: str) -> bool:
-    return any(re.search(p, filename) for p in TEST_FILE_PATTERNS)
+    return TEST_FILE_RE.search(filename) is not None
 
 
 def get_all_test_files():
@@ -69,112 +75,146 @@ def get_all_test_files():
     for test_dir in TEST_DIRS:
         if not test_dir.exists():
             continue
-        for root, dirs, filenames in os.walk(test_dir):
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS and not d.startswith(".")]
-            for f in filenames:
-                if is_test_file(f):
-                    files.append(Path(root) / f)
-    return list(set(files))
+        tracked = list_tracked_py_files(test_dir)
+        if tracked is not None:
+            files.extend(f for f in tracked if is_test_file(f.name))
+            continue
+        files.extend(Path(p) for p in _walk_test_files(str(test_dir)))
+    # TEST_DIRS are disjoint, so every path appears once
+    return files
+
+
+def _walk_test_files(root):
+    """Yield test file paths under root, pruning excluded and hidden directories.
+
+    DirEntry caches its type from the directory read, so no extra stat per entry.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in EXCLUDE_DIRS and not name.startswith("."):
+                        stack.append(entry.path)
+                elif is_test_file(name):
+                    yield entry.path
 
 
 def get_staged_test_files():
-    """Get staged test files."""
-    try:
-        result = run(
-            ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"],
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
-        )
-        return [
-            PROJECT_ROOT / f
-            for f in result.stdout.strip().split("\n")
-            if is_test_file(Path(f).name) and (PROJECT_ROOT / f).exists()
-        ]
-    except Exception:
-        return []
+    """Get staged (or, in CI, PR-changed) test files."""
+    return [
+        PROJECT_ROOT / f
+        for f in ci_changed_files()
+        if is_test_file(Path(f).name) and (PROJECT_ROOT / f).exists()
+    ]
+
+
+def _decorator_has_skip(decorator) -> bool:
+    """True if any name or attribute in the decorator mentions skip."""
+    for node in ast.walk(decorator):
+        if isinstance(node, ast.Attribute) and "skip" in node.attr.lower():
+            return True
+        if isinstance(node, ast.Name) and "skip" in node.id.lower():
+            return True
+    return False
+
+
+class TestCountVisitor(ast.NodeVisitor):
+    """Count test functions (module-level and methods) and skip-decorated ones in one pass."""
+
+    def __init__(self):
+        self.tests = 0
+        self.skipped = 0
+
+    def visit_FunctionDef(self, node):
+        if node.name.startswith("test_"):
+            self.tests += 1
+            # Check decorators for skip markers
+            if any(_decorator_has_skip(d) for d in node.decorator_list):
+                self.skipped += 1
+        self.generic_visit(node)
 
 
-def count_tests_in_file(filepath: Path):
+def needs_parse(data) -> bool:
+    """No test functions or skip markers possible without these — skip parsing."""
+    return data.find(b"test_") != -1 or data.find(b"skip") != -1
+
+
+def analyze_source(filepath: Path, data, tree):
     """Count total tests and skipped tests using AST parsing."""
-    try:
-        content = filepath.read_text(encoding="utf-8", errors="replace")
-        tree = ast.parse(content)
-    except (SyntaxError, UnicodeDecodeError):
+    if tree is None:
         return 0, 0
+    content = data[:].decode("utf-8", errors="replace")
 
-    total_tests = 0
-    skipped_tests = 0
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
-            total_tests += 1
-            # Check decorators for skip markers
-            for decorator in node.decorator_list:
-                dec_str = ast.dump(decorator)
-                if "skip" in dec_str.lower():
-                    skipped_tests += 1
-                    break
+    visitor = TestCountVisitor()
+    visitor.visit(tree)
+    total_tests = visitor.tests
+    skipped_tests = visitor.skipped
 
     # Also count skip patterns in source text (catches runtime skips)
-    runtime_skips = 0
-    for pattern in SKIP_PATTERNS:
-        matches = re.findall(pattern, content)
-        runtime_skips += len(matches)
+    runtime_skips = sum(1 for _ in SKIP_RE.finditer(content))
 
     # Avoid double-counting (decorator skips already counted)
     # Use the higher of AST-detected or pattern-detected
     skipped_tests = max(skipped_tests, runtime_skips)
 
-    # If no AST test functions found, try class-based unittest methods
-    if total_tests == 0:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef) and item.name.startswith("test_"):
-                        total_tests += 1
-
     return total_tests, skipped_tests
 
 
-# --- Main ---
-staged_mode = "--staged" in sys.argv
-max_skip_pct = DEFAULT_MAX_SKIP_PCT
-if "--max" in sys.argv:
-    idx = sys.argv.index("--max")
-    max_skip_pct = float(sys.argv[idx + 1])
-
-test_files = get_staged_test_files() if staged_mode else get_all_test_files()
-if not test_files:
-    print("Skipped Tests Check: No test files found.")
-    sys.exit(0)
-
-total_tests = 0
-total_skipped = 0
-skipped_files = []
-
-for filepath in test_files:
-    tests, skipped = count_tests_in_file(filepath)
-    total_tests += tests
-    total_skipped += skipped
-    if skipped > 0:
-        rel = str(filepath.relative_to(PROJECT_ROOT))
-        skipped_files.append({"file": rel, "skipped": skipped, "total": tests})
-
-skip_pct = (total_skipped / total_tests * 100) if total_tests > 0 else 0
-
-print(f"Skipped Tests Check: {len(test_files)} test files scanned")
-print(f"  Total tests:   {total_tests}")
-print(f"  Skipped tests: {total_skipped} ({skip_pct:.1f}%)")
-print(f"  Max allowed:   {max_skip_pct}%\n")
-
-if skip_pct > max_skip_pct:
-    print(f"BLOCKED: {skip_pct:.1f}% tests skipped (max: {max_skip_pct}%)\n", file=sys.stderr)
-    for f in skipped_files:
-        print(f"  {f['file']}: {f['skipped']} skipped / {f['total']} total", file=sys.stderr)
-    print("\nFix: Remove skip markers and fix or delete the failing tests.", file=sys.stderr)
-    print(f"Skipped tests must not exceed {max_skip_pct}% of total test count.\n", file=sys.stderr)
-    sys.exit(1)
-
-print("Skipped Tests Check: PASSED")
-sys.exit(0)
+def count_tests_in_file(filepath: Path):
+    return analyze(filepath, ("skipped-tests",))["skipped-tests"]
+
+
+def run():
+    staged_mode = "--staged" in sys.argv
+    max_skip_pct = DEFAULT_MAX_SKIP_PCT
+    if "--max" in sys.argv:
+        idx = sys.argv.index("--max")
+        max_skip_pct = float(sys.argv[idx + 1])
+
+    test_files = get_staged_test_files() if staged_mode else get_all_test_files()
+    if not test_files:
+        print("Skipped Tests Check: No test files found.")
+        return 0
+
+    total_tests = 0
+    total_skipped = 0
+    skipped_files = []
+
+    for filepath, (tests, skipped) in zip(
+        test_files, run_checks("skipped-tests", test_files), strict=True
+    ):
+        total_tests += tests
+        total_skipped += skipped
+        if skipped > 0:
+            rel = str(filepath.relative_to(PROJECT_ROOT))
+            skipped_files.append({"file": rel, "skipped": skipped, "total": tests})
+
+    skip_pct = (total_skipped / total_tests * 100) if total_tests > 0 else 0
+
+    print(f"Skipped Tests Check: {len(test_files)} test files scanned")
+    print(f"  Total tests:   {total_tests}")
+    print(f"  Skipped tests: {total_skipped} ({skip_pct:.1f}%)")
+    print(f"  Max allowed:   {max_skip_pct}%\n")
+
+    if skip_pct > max_skip_pct:
+        print(f"BLOCKED: {skip_pct:.1f}% tests skipped (max: {max_skip_pct}%)\n", file=sys.stderr)
+        for f in skipped_files:
+            print(f"  {f['file']}: {f['skipped']} skipped / {f['total']} total", file=sys.stderr)
+        print("\nFix: Remove skip markers and fix or delete the failing tests.", file=sys.stderr)
+        print(
+            f"Skipped tests must not exceed {max_skip_pct}% of total test count.\n", file=sys.stderr
+        )
+        return 1
+
+    print("Skipped Tests Check: PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -12,11 +12,14 @@ Usage:
 
 import argparse
 import ast
-import json
 import re
 import sys
 from pathlib import Path
 
+from _ast_checks import analyze, run_checks
+from _git import list_tracked_py_files
+from _jsonio import dumps, loads
+
 # ADAPT: Point to your project root and source directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 BASELINE_PATH = PROJECT_ROOT / ".memory-layer" / "baselines" / "type-holes.json"
@@ -24,6 +27,7 @@ BASELINE_PATH = PROJECT_ROOT / ".memory-layer" / "baselines" / "type-holes.json"
 SRC_DIR = PROJECT_ROOT / "src"
 
 TYPE_IGNORE_RE = re.compile(r"#\s*type:\s*ignore", re.IGNORECASE)
+CANONICAL_TYPE_IGNORES = ("# type: ignore", "#type: ignore")
 
 
 class TypeHoleVisitor(ast.NodeVisitor):
@@ -40,47 +44,58 @@ class TypeHoleVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def analyze_file(file_path):
-    try:
-        content = file_path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError):
-        return {"type_ignore": 0, "any": 0, "total": 0}
+def needs_parse(data):
+    """Only files that mention Any can hold an Any annotation."""
+    return data.find(b"Any") != -1
+
 
-    # Count # type: ignore
-    ti_count = len(TYPE_IGNORE_RE.findall(content))
+def analyze_source(file_path, data, tree):
+    # Count # type: ignore — plain str.count covers the canonical spellings;
+    # the regex only runs when some other "type:" comment could be a variant
+    ti_count = 0
+    if data.find(b"type:") != -1:
+        content = data[:].decode("utf-8", errors="replace")
+        ti_count = sum(content.count(form) for form in CANONICAL_TYPE_IGNORES)
+        if ti_count != content.count("type:"):
+            ti_count = sum(1 for _ in TYPE_IGNORE_RE.finditer(content))
 
-    # Count Any annotations via AST
-    try:
-        tree = ast.parse(content, filename=str(file_path))
+    # Count Any annotations via AST (no tree: no Any, or unparsable)
+    any_count = 0
+    if tree is not None:
         visitor = TypeHoleVisitor()
         visitor.visit(tree)
         any_count = visitor.any_count
-    except SyntaxError:
-        any_count = 0
 
     return {"type_ignore": ti_count, "any": any_count, "total": ti_count + any_count}
 
 
+def analyze_file(file_path):
+    return analyze(file_path, ("type-holes",))["type-holes"]
+
+
 def find_python_files(paths=None):
     if paths:
         return [Path(p) for p in paths if Path(p).exists() and Path(p).suffix == ".py"]
     if not SRC_DIR.exists():
         return []
-    return [f for f in SRC_DIR.rglob("*.py") if not f.name.startswith(".")]
+    files = list_tracked_py_files(SRC_DIR)
+    if files is None:
+        files = SRC_DIR.rglob("*.py")
+    return [f for f in files if not f.name.startswith(".")]
 
 
 def load_baseline():
     if not BASELINE_PATH.exists():
         return {"total": 0}
-    return json.loads(BASELINE_PATH.read_text())
+    return loads(BASELINE_PATH.read_bytes())
 
 
 def save_baseline(data):
     BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    BASELINE_PATH.write_text(json.dumps(data, indent=2) + "\n")
+    BASELINE_PATH.write_bytes(dumps(data, indent=True) + b"\n")
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="Type Hole Ratchet")
     parser.add_argument("--changed-files", nargs="*", default=None)
     parser.add_argument("--update-baseline", action="store_true")
@@ -89,11 +104,10 @@ def main():
     files = find_python_files(args.changed_files)
     if not files:
         print("Type Hole Check: No Python files found.")
-        sys.exit(0)
+        return 0
 
     total_ti, total_any = 0, 0
-    for f in files:
-        result = analyze_file(f)
+    for result in run_checks("type-holes", files):
         total_ti += result["type_ignore"]
         total_any += result["any"]
     total = total_ti + total_any
@@ -101,7 +115,7 @@ def main():
     if args.update_baseline:
         save_baseline({"total_type_ignores": total_ti, "total_any": total_any, "total": total})
         print(f"Baseline updated: {total} type holes ({total_ti} type:ignore + {total_any} Any)")
-        sys.exit(0)
+        return 0
 
     baseline = load_baseline()
     baseline_total = baseline.get("total", 0)
@@ -112,11 +126,11 @@ def main():
     if total > baseline_total:
         print(f"\nBLOCKED: Type holes increased ({baseline_total} -> {total})")
         print("  Fix: Replace Any with specific types, remove # type: ignore")
-        sys.exit(1)
+        return 1
 
     print("  Type Safety Gate passed")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
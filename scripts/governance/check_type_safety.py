@@ -14,63 +14,159 @@ Type Safety Holes tracked:
 Reads baseline from .memory-layer/baselines/type-safety.json
 Blocks commit if current count exceeds baseline.
 Updates baseline only when count decreases.
+
+The baseline also records per-file counts, so --changed-files can rescan
+only the files a change touches and apply the delta to the baseline total.
+
+Usage:
+    python check_type_safety.py                      # Full scan
+    python check_type_safety.py --changed-files      # Files changed vs base (CI) or staged
+    python check_type_safety.py --changed-files f.py # Explicit files
 """
 
-import json
+import argparse
+import os
 import re
 import sys
 from pathlib import Path
 
+from _filecache import cached_map_files
+from _git import ci_changed_files, list_tracked_py_files
+from _jsonio import dumps, loads
+
 BASELINE_FILE = Path(".memory-layer/baselines/type-safety.json")
+SRC_DIR = Path("src")
 
 HOLE_PATTERNS = [
-    (r"#\s*type:\s*ignore", "type: ignore"),
-    (r"\bAny\b", "Any usage"),
-    (r"\bcast\s*\(", "cast() usage"),
-    (r"#\s*noqa", "noqa comment"),
+    ("type_ignore", r"#\s*type:\s*ignore", "type: ignore"),
+    ("any", r"\bAny\b", "Any usage"),
+    ("cast", r"\bcast\s*\(", "cast() usage"),
+    ("noqa", r"#\s*noqa", "noqa comment"),
 ]
+# One alternation scans each file once; match.lastgroup says which hole it was
+HOLE_RE = re.compile("|".join(f"(?P<{group}>{pattern})" for group, pattern, _ in HOLE_PATTERNS))
+HOLE_NAMES = {group: name for group, _, name in HOLE_PATTERNS}
+# Every hole contains one of these; files with none skip decoding and the regex
+HOLE_TOKENS = (b"Any", b"cast", b"ignore", b"noqa")
+
+
+def count_file_holes(py_file: Path) -> dict[str, int]:
+    """Count type safety holes in a single file, keyed by hole name."""
+    counts: dict[str, int] = {name: 0 for _, _, name in HOLE_PATTERNS}
+    data = py_file.read_bytes()
+    if not any(token in data for token in HOLE_TOKENS):
+        return counts
+    for match in HOLE_RE.finditer(data.decode("utf-8")):
+        counts[HOLE_NAMES[match.lastgroup]] += 1
+    return counts
 
 
-def count_holes(src_path: Path = Path("src")) -> dict[str, int]:
-    """Count all type safety holes in src/."""
-    counts: dict[str, int] = {name: 0 for _, name in HOLE_PATTERNS}
-    total = 0
+def find_src_files(src_path: Path = SRC_DIR) -> list[Path]:
+    files = list_tracked_py_files(src_path)
+    if files is None:
+        files = list(src_path.rglob("*.py"))
+    return files
 
-    if not src_path.exists():
-        return {"total": 0}
 
-    for py_file in src_path.rglob("*.py"):
-        content = py_file.read_text()
-        for pattern, name in HOLE_PATTERNS:
-            matches = len(re.findall(pattern, content))
-            counts[name] += matches
-            total += matches
+def scan_files(files: list[Path]) -> dict[str, dict[str, int]]:
+    """Per-file hole counts keyed by cwd-relative path; files without holes are omitted."""
+    per_file = {}
+    for py_file, counts in zip(
+        files, cached_map_files("type-safety", count_file_holes, files), strict=True
+    ):
+        nonzero = {name: n for name, n in counts.items() if n}
+        if nonzero:
+            per_file[os.path.relpath(py_file).replace("\\", "/")] = nonzero
+    return per_file
 
-    counts["total"] = total
+
+def summarize(per_file: dict[str, dict[str, int]]) -> dict[str, int]:
+    counts: dict[str, int] = {name: 0 for _, _, name in HOLE_PATTERNS}
+    for file_counts in per_file.values():
+        for name, n in file_counts.items():
+            counts[name] += n
+    counts["total"] = sum(counts.values())
     return counts
 
 
-def load_baseline() -> dict[str, int]:
+def count_holes(src_path: Path = SRC_DIR) -> dict[str, int]:
+    """Count all type safety holes in src/."""
+    if not src_path.exists():
+        return {"total": 0}
+    return summarize(scan_files(find_src_files(src_path)))
+
+
+def load_baseline() -> dict:
     if BASELINE_FILE.exists():
-        return json.loads(BASELINE_FILE.read_text())  # type: ignore[no-any-return]
+        return loads(BASELINE_FILE.read_bytes())  # type: ignore[no-any-return]
     return {}
 
 
-def save_baseline(counts: dict[str, int]) -> None:
+def save_baseline(counts: dict[str, int], per_file: dict[str, dict[str, int]]) -> None:
     BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    BASELINE_FILE.write_text(json.dumps(counts, indent=2))
+    BASELINE_FILE.write_bytes(dumps({**counts, "files": per_file}, indent=True) + b"\n")
+
+
+def check_changed(baseline: dict, changed_files: list[str]) -> int:
+    """Rescan only changed src/ files and apply their delta to the baseline."""
+    prefix = SRC_DIR.as_posix() + "/"
+    files = [
+        Path(f)
+        for f in changed_files
+        if f.endswith(".py") and f.replace("\\", "/").startswith(prefix) and Path(f).exists()
+    ]
+    scanned = scan_files(files)
+    rescanned = {os.path.relpath(f).replace("\\", "/") for f in files}
+
+    base_files = baseline["files"]
+    # Deleted (or renamed-away) files take their holes with them
+    per_file = {f: c for f, c in base_files.items() if f not in rescanned and Path(f).exists()}
+    per_file.update(scanned)
+    current = summarize(per_file)
+    baseline_total = baseline.get("total", 0)
+    current_total = current["total"]
+
+    print(f"=== Layer 8: Type Safety Gate ({len(files)} changed file(s)) ===")
+    print(f"Current holes: {current}")
+
+    if current_total > baseline_total:
+        added = current_total - baseline_total
+        print(
+            f"FAIL: Type safety holes INCREASED by {added} (baseline: {baseline_total}, current: {current_total})"
+        )
+        for f in sorted(rescanned):
+            before = sum(base_files.get(f, {}).values())
+            after = sum(scanned.get(f, {}).values())
+            if after > before:
+                print(f"  {f}: {before} -> {after}")
+        print("  → Remove the new type: ignore / Any / cast() usages")
+        return 1
 
+    if current_total < baseline_total:
+        reduced = baseline_total - current_total
+        print(f"PASS: Type safety improved by {reduced} holes (new baseline: {current_total})")
+    else:
+        print(f"PASS: Type safety stable at {current_total} holes")
+    # Keep per-file counts current even when the total is unchanged (holes moved)
+    if per_file != base_files:
+        save_baseline(current, per_file)
+    return 0
 
-def check_type_safety() -> int:
-    current = count_holes()
+
+def check_type_safety(changed_files: list[str] | None = None) -> int:
     baseline = load_baseline()
+    if changed_files is not None and "files" in baseline:
+        return check_changed(baseline, changed_files)
+
+    per_file = scan_files(find_src_files()) if SRC_DIR.exists() else {}
+    current = summarize(per_file)
 
     print("=== Layer 8: Type Safety Gate ===")
     print(f"Current holes: {current}")
 
     if not baseline:
         print("No baseline found — creating baseline now.")
-        save_baseline(current)
+        save_baseline(current, per_file)
         print(f"PASS: Baseline set at {current['total']} holes")
         return 0
 
@@ -88,12 +184,29 @@ def check_type_safety() -> int:
     if current_total < baseline_total:
         reduced = baseline_total - current_total
         print(f"PASS: Type safety improved by {reduced} holes (new baseline: {current_total})")
-        save_baseline(current)
+        save_baseline(current, per_file)
     else:
         print(f"PASS: Type safety stable at {current_total} holes")
+        if baseline.get("files") != per_file:
+            save_baseline(current, per_file)
 
     return 0
 
 
+def run() -> int:
+    parser = argparse.ArgumentParser(description="Type Safety Gate (Ratchet)")
+    parser.add_argument(
+        "--changed-files",
+        nargs="*",
+        default=None,
+        help="Rescan only these files; with no paths, use the CI/staged git diff",
+    )
+    args = parser.parse_args()
+    changed = args.changed_files
+    if changed == []:
+        changed = list(ci_changed_files())
+    return check_type_safety(changed)
+
+
 if __name__ == "__main__":
-    sys.exit(check_type_safety())
+    sys.exit(run())
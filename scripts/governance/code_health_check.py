@@ -15,19 +15,30 @@ Usage:
     python code_health_check.py           # Full scan (CI mode)
     python code_health_check.py --init    # Initialize amnesty baseline
     python code_health_check.py --verbose # Show all orphans (including amnestied)
+    python code_health_check.py --jobs 1  # Scan serially (debugging)
 """
 
+import argparse
 import ast
-import json
+import mmap
 import os
 import re
 import sys
+from functools import cache
+from hashlib import blake2b
 from pathlib import Path
 
+from _ast_cache import load_tree
+from _fs import iter_py_paths
+from _jsonio import dumps, loads
+from _parallel import map_files
+
 # ADAPT: Point to your project directories
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SRC_DIR = PROJECT_ROOT / "src"
 BASELINE_PATH = PROJECT_ROOT / ".memory-layer" / "baselines" / "code-health-baseline.json"
+# Per-file content hash, imports and exports from the last run (restorable as a CI artifact)
+GRAPH_CACHE_PATH = PROJECT_ROOT / ".memory-layer" / "cache" / "code-health-graph.json"
 
 EXCLUDE_DIRS = {
     "node_modules",
@@ -61,51 +72,144 @@ ENTRY_POINT_PATTERNS = [
     r"migrations/",
     r"alembic/",
 ]
+ENTRY_POINT_RE = re.compile("|".join(f"(?:{p})" for p in ENTRY_POINT_PATTERNS))
 
 
 def get_all_files(src_dir: Path):
     """Recursively find Python source files."""
-    files = []
     if not src_dir.exists():
-        return files
-    for root, dirs, filenames in os.walk(src_dir):
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS and not d.startswith(".")]
-        for f in filenames:
-            if f.endswith(".py") and not f.startswith("."):
-                files.append(Path(root) / f)
-    return files
+        return []
+    return [Path(p) for p in sorted(iter_py_paths(src_dir, EXCLUDE_DIRS))]
 
 
 def is_entry_point(filepath: str) -> bool:
-    return any(re.search(p, filepath) for p in ENTRY_POINT_PATTERNS)
+    return ENTRY_POINT_RE.search(filepath) is not None
+
+
+class GovVisitor(ast.NodeVisitor):
+    """Collect imports, imported names and __all__ exports in one descent."""
+
+    def __init__(self):
+        self.imported_modules = set()
+        self.imported_names = set()
+        self.exports = None
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imported_modules.add(alias.name)
+            self.imported_names.add(alias.name.split(".")[-1])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            self.imported_names.add(alias.name)
+        if node.module:
+            self.imported_modules.add(node.module)
+            # Also track sub-modules
+            parts = node.module.split(".")
+            for i in range(1, len(parts)):
+                self.imported_modules.add(".".join(parts[:i]))
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id == "__all__":
+                if isinstance(node.value, ast.List):
+                    self.exports = [
+                        elt.value
+                        for elt in node.value.elts
+                        if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                    ]
+        self.generic_visit(node)
+
+
+def file_digest(path) -> str | None:
+    """blake2b-64 of the file's content, hashed from an mmap to avoid a copy."""
+    try:
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return blake2b(b"", digest_size=8).hexdigest()
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return blake2b(mm, digest_size=8).hexdigest()
+    except (OSError, ValueError):
+        return None
 
 
-def build_import_graph(files):
-    """Build import graph: track which modules are imported by any file."""
+def _scan_one(path: str) -> dict:
+    """Per-file scan result; top-level so worker processes can pickle it."""
+    entry = {"hash": file_digest(path)}
+    tree = load_tree(path)
+    if tree is None:
+        return entry
+    visitor = GovVisitor()
+    visitor.visit(tree)
+    # Lists rather than sets so entries can be stored in the graph cache
+    entry["imported_modules"] = sorted(visitor.imported_modules)
+    entry["imported_names"] = sorted(visitor.imported_names)
+    entry["exports"] = visitor.exports
+    return entry
+
+
+def scan_entries(files, jobs=None, cached=None, rels=None):
+    """Per-file scan results keyed by relpath.
+
+    A cached entry is reused only when its content hash still matches, so
+    uncommitted edits and caches restored from another commit are rescanned.
+    """
+    cached = cached or {}
+    if rels is None:
+        rels = [str(f.relative_to(PROJECT_ROOT)) for f in files]
+    entries, todo = {}, []
+    for i, rel in enumerate(rels):
+        entry = cached.get(rel)
+        if (
+            entry is not None
+            and entry.get("hash") is not None
+            and entry["hash"] == file_digest(files[i])
+        ):
+            entries[rel] = entry
+        else:
+            todo.append(i)
+    fresh = map_files(_scan_one, [str(files[i]) for i in todo], jobs=jobs)
+    entries.update((rels[i], result) for i, result in zip(todo, fresh, strict=True))
+    return entries
+
+
+def merge_entries(entries):
+    """Combine per-file results: (imported_modules, imported_names, all_exports)."""
     imported_modules = set()
+    imported_names = set()
+    all_exports = {}  # module -> list of exported names
 
-    for filepath in files:
-        try:
-            content = filepath.read_text(encoding="utf-8", errors="replace")
-            tree = ast.parse(content)
-        except (SyntaxError, UnicodeDecodeError):
+    for rel, result in entries.items():
+        if "imported_modules" not in result:
             continue
+        imported_modules.update(result["imported_modules"])
+        imported_names.update(result["imported_names"])
+        if result["exports"] is not None:
+            all_exports[rel] = result["exports"]
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imported_modules.add(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imported_modules.add(node.module)
-                    # Also track sub-modules
-                    parts = node.module.split(".")
-                    for i in range(1, len(parts)):
-                        imported_modules.add(".".join(parts[:i]))
+    return imported_modules, imported_names, all_exports
 
-    return imported_modules
 
+def scan_files(files, jobs=None):
+    """Visit each file once: (imported_modules, imported_names, all_exports)."""
+    return merge_entries(scan_entries(files, jobs=jobs))
 
+
+def load_graph_cache():
+    try:
+        return loads(GRAPH_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_graph_cache(entries):
+    GRAPH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = GRAPH_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_bytes(dumps(entries))
+    tmp.replace(GRAPH_CACHE_PATH)
+
+
+@cache
 def file_to_module(filepath: Path, src_dir: Path) -> str:
     """Convert file path to Python module path."""
     try:
@@ -120,64 +224,45 @@ def file_to_module(filepath: Path, src_dir: Path) -> str:
         return ""
 
 
-def find_dead_exports(files):
-    """Find __all__ members that are never imported by other files."""
-    all_exports = {}  # module -> list of exported names
-    imported_names = set()
-    dead_exports = []
+def module_ancestors(module: str) -> tuple[str, ...]:
+    """'a.b.c' -> ('a', 'a.b', 'a.b.c')."""
+    parts = module.split(".")
+    return tuple(".".join(parts[: i + 1]) for i in range(len(parts)))
 
-    # Collect __all__ exports
-    for filepath in files:
-        try:
-            content = filepath.read_text(encoding="utf-8", errors="replace")
-            tree = ast.parse(content)
-        except (SyntaxError, UnicodeDecodeError):
-            continue
 
+def file_records(files):
+    """(rel, is_entry, ancestors) per file, computed once for the orphan check."""
+    records = []
+    for filepath in files:
         rel = str(filepath.relative_to(PROJECT_ROOT))
+        module = file_to_module(filepath, SRC_DIR)
+        records.append((rel, is_entry_point(rel), module_ancestors(module) if module else ()))
+    return records
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "__all__":
-                        if isinstance(node.value, ast.List):
-                            names = []
-                            for elt in node.value.elts:
-                                if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                                    names.append(elt.value)
-                            all_exports[rel] = names
-
-    # Collect all imported names
-    for filepath in files:
-        try:
-            content = filepath.read_text(encoding="utf-8", errors="replace")
-            tree = ast.parse(content)
-        except (SyntaxError, UnicodeDecodeError):
-            continue
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                if node.names:
-                    for alias in node.names:
-                        imported_names.add(alias.name)
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    parts = alias.name.split(".")
-                    imported_names.add(parts[-1])
+def find_orphans(records, imported_modules):
+    """Non-entry-point files whose module (or any parent package) nothing imports."""
+    return [
+        rel
+        for rel, is_entry, ancestors in records
+        if not is_entry and ancestors and not any(a in imported_modules for a in ancestors)
+    ]
 
-    # Find dead exports
+
+def find_dead_exports(all_exports, imported_names):
+    """Find __all__ members that are never imported by other files."""
+    dead_exports = []
     for filepath, exports in all_exports.items():
         for name in exports:
             if name not in imported_names:
                 dead_exports.append({"symbol": name, "file": filepath})
-
     return dead_exports
 
 
 def load_baseline():
     try:
         if BASELINE_PATH.exists():
-            return json.loads(BASELINE_PATH.read_text())
+            return loads(BASELINE_PATH.read_bytes())
         return None
     except Exception:
         return None
@@ -185,112 +270,121 @@ def load_baseline():
 
 def save_baseline(data):
     BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    BASELINE_PATH.write_text(json.dumps(data, indent=2))
-
-
-# --- Main ---
-init_mode = "--init" in sys.argv
-verbose = "--verbose" in sys.argv
-
-all_files = get_all_files(SRC_DIR)
-if not all_files:
-    print("Code Health Check: No source files found.")
-    sys.exit(0)
-
-# Build import graph
-imported_modules = build_import_graph(all_files)
-
-# Find orphan files
-orphan_files = []
-for filepath in all_files:
-    rel = str(filepath.relative_to(PROJECT_ROOT))
-    if is_entry_point(rel):
-        continue
-    module = file_to_module(filepath, SRC_DIR)
-    if module and module not in imported_modules:
-        # Double-check: also check if any partial module path matches
-        parts = module.split(".")
-        is_imported = False
-        for i in range(len(parts)):
-            partial = ".".join(parts[: i + 1])
-            if partial in imported_modules:
-                is_imported = True
-                break
-        if not is_imported:
-            orphan_files.append(rel)
-
-# Find dead exports
-dead_exports = find_dead_exports(all_files)
-
-total_violations = len(orphan_files) + len(dead_exports)
-
-if init_mode:
-    save_baseline(
-        {
-            "orphan_files": len(orphan_files),
-            "dead_exports": len(dead_exports),
-            "total": total_violations,
-            "orphan_list": orphan_files,
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
-        }
-    )
-    print(
-        f"Code Health Baseline initialized: {total_violations} violations "
-        f"({len(orphan_files)} orphan files, {len(dead_exports)} dead exports)"
-    )
-    sys.exit(0)
-
-baseline = load_baseline()
-baseline_total = baseline["total"] if baseline else 0
-
-print(f"Code Health Check: {len(all_files)} files scanned")
-print(f"  Orphan files:  {len(orphan_files)}")
-print(f"  Dead exports:  {len(dead_exports)}")
-print(f"  Total: {total_violations} | Baseline: {baseline_total}\n")
-
-if verbose:
-    if orphan_files:
-        print("Orphan files:")
-        for f in orphan_files:
-            print(f"  - {f}")
-    if dead_exports:
-        print("Dead exports:")
-        for d in dead_exports[:20]:
-            print(f"  - {d['symbol']} in {d['file']}")
-        if len(dead_exports) > 20:
-            print(f"  ... and {len(dead_exports) - 20} more")
-    print()
-
-if total_violations > baseline_total:
-    new_count = total_violations - baseline_total
-    print(
-        f"BLOCKED: {new_count} NEW code health violation(s) above baseline "
-        f"({baseline_total} -> {total_violations})\n",
-        file=sys.stderr,
+    BASELINE_PATH.write_bytes(dumps(data, indent=True))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Code Health Check")
+    parser.add_argument("--init", action="store_true", help="Initialize amnesty baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show all orphans")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (1 = serial)")
+    args = parser.parse_args()
+    init_mode = args.init
+    verbose = args.verbose
+
+    all_files = get_all_files(SRC_DIR)
+    if not all_files:
+        print("Code Health Check: No source files found.")
+        return 0
+
+    # Build import graph and collect __all__ exports in one pass. Files whose
+    # content hash matches the cached graph are not reparsed.
+    cached = load_graph_cache()
+    records = file_records(all_files)
+    entries = scan_entries(
+        all_files,
+        jobs=args.jobs,
+        cached=cached,
+        rels=[rel for rel, _, _ in records],
     )
+    try:
+        save_graph_cache(entries)
+    except OSError:
+        pass
+    imported_modules, imported_names, all_exports = merge_entries(entries)
 
-    baseline_orphans = set(baseline.get("orphan_list", []) if baseline else [])
-    new_orphans = [f for f in orphan_files if f not in baseline_orphans]
-    if new_orphans:
-        print("New orphan files:", file=sys.stderr)
-        for f in new_orphans:
-            print(f"  {f}", file=sys.stderr)
-
-    print("\nFix: Delete unused files, or import them from an appropriate module.", file=sys.stderr)
-    print("Baseline can only go DOWN, never UP.\n", file=sys.stderr)
-    sys.exit(1)
-
-if total_violations < baseline_total:
-    save_baseline(
-        {
-            "orphan_files": len(orphan_files),
-            "dead_exports": len(dead_exports),
-            "total": total_violations,
-            "orphan_list": orphan_files,
-            "timestamp": __import__("datetime").datetime.now().isoformat(),
-        }
-    )
-    print(f"Baseline improved: {baseline_total} -> {total_violations} (ratcheted down)")
+    # Find orphan files
+    orphan_files = find_orphans(records, imported_modules)
 
-print("Code Health Check: PASSED")
-sys.exit(0)
+    # Find dead exports
+    dead_exports = find_dead_exports(all_exports, imported_names)
+
+    total_violations = len(orphan_files) + len(dead_exports)
+
+    if init_mode:
+        save_baseline(
+            {
+                "orphan_files": len(orphan_files),
+                "dead_exports": len(dead_exports),
+                "total": total_violations,
+                "orphan_list": orphan_files,
+                "timestamp": __import__("datetime").datetime.now().isoformat(),
+            }
+        )
+        print(
+            f"Code Health Baseline initialized: {total_violations} violations "
+            f"({len(orphan_files)} orphan files, {len(dead_exports)} dead exports)"
+        )
+        return 0
+
+    baseline = load_baseline()
+    baseline_total = baseline["total"] if baseline else 0
+
+    print(f"Code Health Check: {len(all_files)} files scanned")
+    print(f"  Orphan files:  {len(orphan_files)}")
+    print(f"  Dead exports:  {len(dead_exports)}")
+    print(f"  Total: {total_violations} | Baseline: {baseline_total}\n")
+
+    if verbose:
+        if orphan_files:
+            print("Orphan files:")
+            for f in orphan_files:
+                print(f"  - {f}")
+        if dead_exports:
+            print("Dead exports:")
+            for d in dead_exports[:20]:
+                print(f"  - {d['symbol']} in {d['file']}")
+            if len(dead_exports) > 20:
+                print(f"  ... and {len(dead_exports) - 20} more")
+        print()
+
+    if total_violations > baseline_total:
+        new_count = total_violations - baseline_total
+        print(
+            f"BLOCKED: {new_count} NEW code health violation(s) above baseline "
+            f"({baseline_total} -> {total_violations})\n",
+            file=sys.stderr,
+        )
+
+        baseline_orphans = set(baseline.get("orphan_list", []) if baseline else [])
+        new_orphans = [f for f in orphan_files if f not in baseline_orphans]
+        if new_orphans:
+            print("New orphan files:", file=sys.stderr)
+            for f in new_orphans:
+                print(f"  {f}", file=sys.stderr)
+
+        print(
+            "\nFix: Delete unused files, or import them from an appropriate module.",
+            file=sys.stderr,
+        )
+        print("Baseline can only go DOWN, never UP.\n", file=sys.stderr)
+        return 1
+
+    if total_violations < baseline_total:
+        save_baseline(
+            {
+                "orphan_files": len(orphan_files),
+                "dead_exports": len(dead_exports),
+                "total": total_violations,
+                "orphan_list": orphan_files,
+                "timestamp": __import__("datetime").datetime.now().isoformat(),
+            }
+        )
+        print(f"Baseline improved: {baseline_total} -> {total_violations} (ratcheted down)")
+
+    print("Code Health Check: PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
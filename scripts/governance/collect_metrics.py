@@ -5,79 +5,122 @@ Collects governance health metrics for reporting.
 Output: .metrics/current-metrics.json
 
 Usage:
-    python collect_metrics.py
+    python collect_metrics.py          # Collect and append to history
+    python collect_metrics.py --trim   # Trim history to the last 50 entries now
 """
 
+import argparse
 import json
 import sys
+from collections import deque
 from datetime import UTC
 from pathlib import Path
 
+from _readall import read_all
+from _scan import MARKER_KEYS, analyze
+
 # ADAPT: Project root and source/test directories
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SRC_DIR = PROJECT_ROOT / "src"
 TEST_DIR = PROJECT_ROOT / "tests"
 METRICS_DIR = PROJECT_ROOT / ".metrics"
-
-
-def count_lines(directory, ext=".py"):
-    total = 0
-    if directory.exists():
-        for f in directory.rglob(f"*{ext}"):
-            try:
-                total += len([l for l in f.read_text().splitlines() if l.strip()])
-            except (OSError, UnicodeDecodeError):
-                pass
-    return total
-
-
-def count_pattern(directory, pattern, ext=".py"):
-    count = 0
-    if directory.exists():
-        for f in directory.rglob(f"*{ext}"):
-            try:
-                count += f.read_text().count(pattern)
-            except (OSError, UnicodeDecodeError):
-                pass
-    return count
+# One JSON object per line: each run appends, trimming keeps the newest entries
+HISTORY_FILE = METRICS_DIR / "metrics-history.jsonl"
+# Pre-JSONL history (one JSON array), imported into HISTORY_FILE once
+LEGACY_HISTORY_FILE = METRICS_DIR / "metrics-history.json"
+HISTORY_LIMIT = 50
+# Trimming rewrites the file, so it waits until the history doubles
+TRIM_AT_LINES = 2 * HISTORY_LIMIT
+
+
+def collect(directory, ext=".py"):
+    """Code LOC, file count and MARKER_KEYS counts, reading and tokenizing each file once."""
+    metrics = {"loc": 0, "file_count": 0, **dict.fromkeys(MARKER_KEYS, 0)}
+    if not directory.exists():
+        return metrics
+    files = list(directory.rglob(f"*{ext}"))
+    metrics["file_count"] = len(files)
+    for data in read_all(files).values():
+        scan = analyze(data)
+        metrics["loc"] += scan["loc"]
+        for key in MARKER_KEYS:
+            metrics[key] += scan[key]
+    return metrics
+
+
+def migrate_legacy_history():
+    """Move entries from the old JSON-array history into HISTORY_FILE, then delete it."""
+    if not LEGACY_HISTORY_FILE.exists():
+        return
+    try:
+        legacy = json.loads(LEGACY_HISTORY_FILE.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        legacy = []
+    if isinstance(legacy, list) and legacy:
+        existing = HISTORY_FILE.read_text(encoding="utf-8") if HISTORY_FILE.exists() else ""
+        lines = "".join(json.dumps(entry) + "\n" for entry in legacy[-HISTORY_LIMIT:])
+        tmp = HISTORY_FILE.with_suffix(".tmp")
+        tmp.write_text(lines + existing, encoding="utf-8")
+        tmp.replace(HISTORY_FILE)
+    LEGACY_HISTORY_FILE.unlink()
+
+
+def append_history(metrics):
+    """Append one entry; returns the number of lines now in the history file."""
+    with open(HISTORY_FILE, "a+", encoding="utf-8") as fh:
+        fh.write(json.dumps(metrics) + "\n")
+        fh.seek(0)
+        return sum(1 for _ in fh)
+
+
+def trim_history(limit=HISTORY_LIMIT):
+    """Rewrite the history file keeping only its last `limit` lines."""
+    try:
+        with open(HISTORY_FILE, encoding="utf-8") as fh:
+            tail = deque(fh, maxlen=limit)
+    except OSError:
+        return
+    tmp = HISTORY_FILE.with_suffix(".tmp")
+    tmp.write_text("".join(tail), encoding="utf-8")
+    tmp.replace(HISTORY_FILE)
 
 
 def main():
     from datetime import datetime
 
+    parser = argparse.ArgumentParser(description="Governance Metrics Collector")
+    parser.add_argument(
+        "--trim", action="store_true", help=f"Trim history to the last {HISTORY_LIMIT} entries"
+    )
+    args = parser.parse_args()
+
+    src = collect(SRC_DIR)
     metrics = {
         "timestamp": datetime.now(UTC).isoformat(),
-        "source_loc": count_lines(SRC_DIR),
-        "test_loc": count_lines(TEST_DIR),
-        "type_ignores": count_pattern(SRC_DIR, "# type: ignore"),
-        "any_annotations": count_pattern(SRC_DIR, ": Any"),
-        "noqa_comments": count_pattern(SRC_DIR, "# noqa"),
-        "pylint_disables": count_pattern(SRC_DIR, "# pylint: disable"),
-        "file_count": len(list(SRC_DIR.rglob("*.py"))) if SRC_DIR.exists() else 0,
+        # *_code_loc: code lines only (no blanks, comments or docstrings). The
+        # earlier source_loc/test_loc keys counted every non-blank line.
+        "source_code_loc": src["loc"],
+        "test_code_loc": collect(TEST_DIR)["loc"],
+        **{key: src[key] for key in MARKER_KEYS},
+        "file_count": src["file_count"],
     }
 
     # Test-to-source ratio
-    if metrics["source_loc"] > 0:
-        metrics["test_source_ratio"] = round(metrics["test_loc"] / metrics["source_loc"], 2)
+    if metrics["source_code_loc"] > 0:
+        metrics["test_source_code_ratio"] = round(
+            metrics["test_code_loc"] / metrics["source_code_loc"], 2
+        )
     else:
-        metrics["test_source_ratio"] = 0
+        metrics["test_source_code_ratio"] = 0
 
     METRICS_DIR.mkdir(parents=True, exist_ok=True)
     output = METRICS_DIR / "current-metrics.json"
     output.write_text(json.dumps(metrics, indent=2) + "\n")
 
-    # Append to history (rolling 50 entries)
-    history_file = METRICS_DIR / "metrics-history.json"
-    history = []
-    if history_file.exists():
-        try:
-            history = json.loads(history_file.read_text())
-        except (json.JSONDecodeError, OSError):
-            pass
-    history.append(metrics)
-    if len(history) > 50:
-        history = history[-50:]
-    history_file.write_text(json.dumps(history, indent=2) + "\n")
+    # Append to history; the last HISTORY_LIMIT entries survive each trim
+    migrate_legacy_history()
+    if append_history(metrics) > TRIM_AT_LINES or args.trim:
+        trim_history()
 
     print(f"Metrics collected: {output}")
     for k, v in metrics.items():
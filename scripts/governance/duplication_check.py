@@ -8,61 +8,159 @@ Usage:
     python duplication_check.py                   # Full scan
     python duplication_check.py --changed-files   # Rising-tide (CI mode)
     python duplication_check.py --max-clones 5    # Amnesty tolerance
+    python duplication_check.py --jobs 1          # Scan serially (debugging)
 """
 
 import argparse
 import os
 import sys
+from functools import partial
+from hashlib import blake2b
 from pathlib import Path
-from subprocess import run
+
+from _git import changed_files
+from _parallel import map_files
+
+# Optional: numba compiles the rolling-hash loop; pure Python otherwise
+try:
+    import numpy as np
+    from numba import njit
+
+    HAS_JIT = True
+except ImportError:
+    HAS_JIT = False
 
 # ADAPT: Project root and source directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_MIN_LINES = 7
 
+# Rabin-Karp window fingerprint parameters (64-bit polynomial hash)
+HASH_BASE = 1315423911
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
 
 def get_changed_files(base_ref="main"):
-    try:
-        result = run(
-            ["git", "diff", "--name-only", "--diff-filter=ACM", f"origin/{base_ref}...HEAD"],
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
-        )
-        return {
-            f
-            for f in result.stdout.strip().split("\n")
-            if f.endswith(".py") and f.startswith("src/")
-        }
-    except Exception:
-        return set()
+    return {f for f in changed_files(base_ref) if f.endswith(".py") and f.startswith("src/")}
 
 
-def find_duplicates(paths, min_lines):
+def _stripped_lines(path):
+    try:
+        return [l.strip() for l in Path(path).read_text(encoding="utf-8").splitlines()]
+    except OSError:
+        return None
+
+
+def _line_hash(line):
+    # Deterministic across processes, unlike hash(str) under PYTHONHASHSEED
+    return int.from_bytes(blake2b(line.encode(), digest_size=8).digest(), "little")
+
+
+def _window_hashes_py(line_h, min_lines, code_mask, base, drop):
+    hashes, starts = [], []
+    h = 0
+    count = 0
+    for i in range(min_lines):
+        h = (h * base + line_h[i]) & HASH_MASK
+        count += code_mask[i]
+    for start in range(len(line_h) - min_lines + 1):
+        if start:
+            h = (h * base - line_h[start - 1] * drop + line_h[start + min_lines - 1]) & HASH_MASK
+            count += code_mask[start + min_lines - 1] - code_mask[start - 1]
+        if count:
+            hashes.append(h)
+            starts.append(start + 1)
+    return hashes, starts
+
+
+if HAS_JIT:
+
+    @njit(cache=True, boundscheck=False)
+    def _window_hashes_jit(line_h, min_lines, code_mask, base, drop):
+        n = line_h.shape[0] - min_lines + 1
+        hashes = np.empty(n, dtype=np.uint64)
+        starts = np.empty(n, dtype=np.int64)
+        # uint64 arithmetic wraps mod 2**64, matching the masked Python version
+        h = np.uint64(0)
+        count = 0
+        for i in range(min_lines):
+            h = h * base + line_h[i]
+            count += code_mask[i]
+        k = 0
+        for start in range(n):
+            if start > 0:
+                h = h * base - line_h[start - 1] * drop + line_h[start + min_lines - 1]
+                count += code_mask[start + min_lines - 1] - code_mask[start - 1]
+            if count > 0:
+                hashes[k] = h
+                starts[k] = start + 1
+                k += 1
+        return hashes[:k], starts[:k]
+
+
+def _window_hashes(line_h, min_lines, code_mask):
+    """Fingerprints and 1-based start lines of windows holding at least one code line."""
+    drop = pow(HASH_BASE, min_lines, HASH_MASK + 1)
+    if HAS_JIT:
+        hashes, starts = _window_hashes_jit(
+            np.array(line_h, dtype=np.uint64),
+            min_lines,
+            np.array(code_mask, dtype=np.int64),
+            np.uint64(HASH_BASE),
+            np.uint64(drop),
+        )
+        return hashes.tolist(), starts.tolist()
+    return _window_hashes_py(line_h, min_lines, code_mask, HASH_BASE, drop)
+
+
+def _scan_one(path: str, min_lines: int) -> list:
+    """(window fingerprint, start line) pairs for one file; top-level so worker processes can pickle it.
+
+    Windows are fingerprinted with a 64-bit Rabin-Karp rolling hash over
+    per-line hashes, so each slide costs one multiply-add instead of
+    building and hashing a min_lines-tuple of strings.
+    """
+    lines = _stripped_lines(path)
+    if lines is None or len(lines) < min_lines:
+        return []
+    line_h = [_line_hash(l) for l in lines]
+    code_mask = [1 if l and not l.startswith("#") else 0 for l in lines]
+    return list(zip(*_window_hashes(line_h, min_lines, code_mask), strict=True))
+
+
+def _split_collisions(blocks, min_lines):
+    """Group (rel, line) blocks sharing a fingerprint by their exact window text."""
+    lines_by_file = {}
+    exact = {}
+    for rel, line in blocks:
+        if rel not in lines_by_file:
+            lines_by_file[rel] = _stripped_lines(PROJECT_ROOT / rel) or []
+        window = tuple(lines_by_file[rel][line - 1 : line - 1 + min_lines])
+        exact.setdefault(window, set()).add((rel, line))
+    return [list(unique) for unique in exact.values() if len(unique) > 1]
+
+
+def find_duplicates(paths, min_lines, jobs=None):
     """Find duplicate code blocks using sliding window."""
-    occurrences = {}
+    py_files = []
     for path_str in paths:
         root = PROJECT_ROOT / path_str
-        py_files = [root] if root.is_file() else list(root.rglob("*.py")) if root.is_dir() else []
-        for py in py_files:
-            try:
-                lines = py.read_text(encoding="utf-8").splitlines()
-            except OSError:
-                continue
-            if len(lines) < min_lines:
-                continue
-            rel = str(py.relative_to(PROJECT_ROOT)).replace("\\", "/")
-            for start in range(len(lines) - min_lines + 1):
-                window = tuple(l.strip() for l in lines[start : start + min_lines])
-                if not any(l and not l.startswith("#") for l in window):
-                    continue
-                occurrences.setdefault(window, []).append((rel, start + 1))
+        py_files += [root] if root.is_file() else list(root.rglob("*.py")) if root.is_dir() else []
+
+    occurrences = {}
+    scans = map_files(
+        partial(_scan_one, min_lines=min_lines), [str(p) for p in py_files], jobs=jobs
+    )
+    for py, windows in zip(py_files, scans, strict=True):
+        rel = str(py.relative_to(PROJECT_ROOT)).replace("\\", "/")
+        for fingerprint, line in windows:
+            occurrences.setdefault(fingerprint, []).append((rel, line))
 
     groups = []
     for blocks in occurrences.values():
-        unique = {(r, s) for r, s in blocks}
+        unique = set(blocks)
         if len(unique) > 1:
-            groups.append(list(unique))
+            # Only fingerprint matches are re-read and compared exactly
+            groups.extend(_split_collisions(unique, min_lines))
     return groups
 
 
@@ -73,9 +171,10 @@ def main():
     parser.add_argument("--max-clones", type=int, default=0)
     parser.add_argument("--changed-files", action="store_true")
     parser.add_argument("--base-ref", default=os.environ.get("BASE_REF", "main"))
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (1 = serial)")
     args = parser.parse_args()
 
-    groups = find_duplicates(args.paths, args.min_lines)
+    groups = find_duplicates(args.paths, args.min_lines, jobs=args.jobs)
 
     if args.changed_files:
         changed = get_changed_files(args.base_ref)
@@ -22,7 +22,7 @@ THRESHOLDS = {
     "type_ignores": {"fail": 50, "description": "type: ignore comments"},
     "any_annotations": {"fail": 30, "description": "Any type annotations"},
     "noqa_comments": {"fail": 20, "description": "noqa suppressions"},
-    "test_source_ratio": {"fail_below": 0.5, "description": "Test-to-source ratio"},
+    "test_source_code_ratio": {"fail_below": 0.5, "description": "Test-to-source code ratio"},
 }
 
 
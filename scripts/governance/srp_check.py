@@ -15,44 +15,112 @@ Usage:
 """
 
 import argparse
-import ast
-import json
 import sys
-from datetime import date
+from itertools import accumulate
 from pathlib import Path
 
+from _fs import iter_py
+
+# ast, the AST cache, JSON and the process pool are imported where first used:
+# a hook run on a diff with no Python files never pays for them.
+
 # ADAPT: Thresholds
 IMPL_FAIL = 600
 TEST_FAIL = 300
 FUNC_FAIL = 75
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Below this many files a process pool costs more than it saves
+MIN_PARALLEL_FILES = 64
 
 
 def is_test_file(path):
     return "tests" in path.parts or path.name.startswith("test_")
 
 
-def count_loc(node, lines):
-    """Count non-blank, non-comment lines within an AST node's span."""
-    code_lines = set()
-    for child in ast.walk(node):
-        lineno = getattr(child, "lineno", None)
-        end = getattr(child, "end_lineno", None) or lineno
-        if lineno and end:
-            for idx in range(lineno, end + 1):
-                if 1 <= idx <= len(lines):
-                    text = lines[idx - 1].strip()
-                    if text and not text.startswith("#"):
-                        code_lines.add(idx)
-    return len(code_lines)
+def span_start(node):
+    """First line of a statement, including any decorators above it."""
+    decorators = getattr(node, "decorator_list", ())
+    return min([node.lineno, *(d.lineno for d in decorators)])
+
+
+def iter_funcs(tree):
+    """Yield every (async) function def in tree, in source order, descending statements only.
+
+    Function defs are always statements, so expression subtrees are skipped.
+    Handlers and match cases hold statement bodies and are descended too.
+    """
+    import ast
+
+    func_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    descend = (ast.stmt, ast.excepthandler, ast.match_case)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, func_types):
+            yield node
+        stack.extend(reversed([c for c in ast.iter_child_nodes(node) if isinstance(c, descend)]))
+
+
+def code_mask(lines):
+    """bytearray indexed by line number: 1 for lines that are neither blank nor a comment."""
+    mask = bytearray(1)  # line 0 does not exist
+    mask += bytes(text != "" and text[0] != "#" for text in map(str.lstrip, lines))
+    return mask
+
+
+def code_bitmap(tree, lines):
+    """code_mask() restricted to the lines inside a statement.
+
+    Nested nodes lie within their top-level statement's span, so copying the
+    top-level spans covers every node without walking the tree.
+    """
+    mask = code_mask(lines)
+    bitmap = bytearray(len(mask))
+    for stmt in tree.body:
+        start, end = span_start(stmt), stmt.end_lineno + 1
+        bitmap[start:end] = mask[start:end]
+    return bitmap
+
+
+def analyze_file(py):
+    """(rel, file LOC, [(lineno, name, LOC) per function]) for one file, or None if unparsable."""
+    from _ast_index import get_tree, read_bytes
+
+    raw = read_bytes(py)
+    if raw is None:
+        return None
+    try:
+        lines = raw.decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        return None
+    tree = get_tree(py)
+    if tree is None:
+        return None
+    # prefix[i] is the code-line count over lines 1..i, so any span is O(1)
+    prefix = list(accumulate(code_bitmap(tree, lines)))
+    last = len(prefix) - 1
+    funcs = [
+        (
+            node.lineno,
+            node.name,
+            prefix[min(node.end_lineno, last)] - prefix[min(span_start(node) - 1, last)],
+        )
+        for node in iter_funcs(tree)
+    ]
+    return str(py).replace("\\", "/"), prefix[-1], funcs
 
 
 def load_exemptions(path):
     """Load exemptions JSON: [{"path": str, "justification": str, "expiresAt"?: str}]"""
     if not path.exists():
         return set()
+    import json
+    from datetime import date
+
+    from _jsonio import loads
+
     try:
-        data = json.loads(path.read_text())
+        data = loads(path.read_bytes())
         exempt = set()
         for entry in data:
             expires = entry.get("expiresAt")
@@ -68,7 +136,7 @@ def load_exemptions(path):
         return set()
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="SRP Size Guardrails")
     parser.add_argument("paths", nargs="*", default=["src", "tests"])
     parser.add_argument("--exemptions-file", default=".srp-exemptions.json")
@@ -80,45 +148,54 @@ def main():
     exemptions = load_exemptions(Path(args.exemptions_file))
     file_failures, func_failures = [], []
 
+    py_files = []
     for path_str in args.paths:
         root = Path(path_str)
-        py_files = [root] if root.is_file() else list(root.rglob("*.py")) if root.is_dir() else []
-        for py in py_files:
-            rel = str(py).replace("\\", "/")
-            if rel in exemptions:
-                continue
-            try:
-                text = py.read_text(encoding="utf-8")
-                lines = text.splitlines()
-                tree = ast.parse(text, filename=str(py))
-            except (OSError, SyntaxError):
-                continue
-
-            file_loc = count_loc(tree, lines)
-            threshold = args.test_fail if is_test_file(py) else args.impl_fail
-            if file_loc > threshold:
-                file_failures.append(f"{rel}: {file_loc} LOC (limit: {threshold})")
-
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    func_loc = count_loc(node, lines)
-                    if func_loc > args.func_fail:
-                        func_failures.append(
-                            f"{rel}:{node.lineno} {node.name}() is {func_loc} LOC (limit: {args.func_fail})"
-                        )
+        py_files += (
+            [root]
+            if root.is_file()
+            else [Path(e.path) for e in iter_py(root)]
+            if root.is_dir()
+            else []
+        )
+    py_files = [py for py in py_files if str(py).replace("\\", "/") not in exemptions]
+    if not py_files:
+        print("SRP Check PASSED — all files and functions within limits")
+        return 0
+
+    from _parallel import map_files
+
+    results = map_files(analyze_file, py_files, min_parallel=MIN_PARALLEL_FILES, chunksize=32)
+    for py, result in zip(py_files, results, strict=True):
+        if result is None:
+            continue
+        rel, file_loc, funcs = result
+        threshold = args.test_fail if is_test_file(py) else args.impl_fail
+        if file_loc > threshold:
+            file_failures.append(f"{rel}: {file_loc} LOC (limit: {threshold})")
+        for lineno, name, func_loc in funcs:
+            if func_loc > args.func_fail:
+                func_failures.append(
+                    f"{rel}:{lineno} {name}() is {func_loc} LOC (limit: {args.func_fail})"
+                )
 
     if file_failures or func_failures:
-        print("BLOCKED: SRP size limits exceeded\n")
-        for msg in file_failures:
-            print(f"  {msg}")
-        for msg in func_failures:
-            print(f"  {msg}")
-        print("\nFix: Split large files/functions into smaller units.")
-        sys.exit(1)
+        # One write for the whole report: failure lists can run to hundreds of lines
+        report = [f"  {msg}" for msg in (*file_failures, *func_failures)]
+        print(
+            "\n".join(
+                [
+                    "BLOCKED: SRP size limits exceeded\n",
+                    *report,
+                    "\nFix: Split large files/functions into smaller units.",
+                ]
+            )
+        )
+        return 1
 
     print("SRP Check PASSED — all files and functions within limits")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
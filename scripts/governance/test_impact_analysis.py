@@ -18,6 +18,25 @@ import sys
 from subprocess import run
 
 
+def has_python_changes():
+    """False only when git reports no changed or untracked .py file vs HEAD.
+
+    Covers staged, unstaged, deleted and renamed files. Any git failure
+    (no repo, no HEAD yet) counts as changed, so tests still run.
+    """
+    try:
+        result = run(
+            ["git", "status", "--porcelain", "--untracked-files=all", "-z"],
+            capture_output=True,
+            cwd=os.getcwd(),
+        )
+    except OSError:
+        return True
+    if result.returncode != 0:
+        return True
+    return any(entry.endswith(b".py") for entry in result.stdout.split(b"\0"))
+
+
 def main():
     is_ci = os.environ.get("CI") == "true"
 
@@ -27,6 +46,9 @@ def main():
         result = run(["pytest", "--tb=short", "-q"], cwd=os.getcwd())
         sys.exit(result.returncode)
     else:
+        if not has_python_changes():
+            print("Test Impact Analysis: no Python changes — skipping")
+            sys.exit(0)
         # Local: run only affected tests via testmon
         print("Test Impact Analysis: Local mode — running affected tests only")
         result = run(["pytest", "--testmon", "--tb=short", "-q"], cwd=os.getcwd())
@@ -12,10 +12,15 @@ Usage:
 
 import argparse
 import ast
-import json
+import fnmatch
+import re
 import sys
 from pathlib import Path
 
+from _ast_index import get_tree, read_bytes
+from _fs import iter_py
+from _jsonio import dumps, loads
+
 # ADAPT: Project root and source directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SRC_DIR = PROJECT_ROOT / "src"
@@ -24,6 +29,8 @@ BASELINE_PATH = PROJECT_ROOT / ".memory-layer" / "baselines" / "behavioral-pairi
 
 # ADAPT: Filename patterns that indicate I/O adapters
 IO_PATTERNS = ["*_repository.py", "*_adapter.py", "*_client.py", "*_store.py"]
+# All IO_PATTERNS as one regex over the file name; group i+1 is IO_PATTERNS[i]
+_IO_NAME_RE = re.compile("|".join(f"({fnmatch.translate(p)})" for p in IO_PATTERNS))
 # ADAPT: Import modules that indicate I/O operations
 IO_MODULES = {
     "psycopg2",
@@ -39,18 +46,38 @@ IO_MODULES = {
     "stripe",
     "openai",
 }
+# Files containing none of these bytes cannot import an IO module: skip the parse
+IO_MODULES_BYTES = tuple(m.encode() for m in IO_MODULES)
+
+
+def module_imports(body):
+    """Yield module-level Import/ImportFrom nodes, including those under if/try blocks.
+
+    Covers `if TYPE_CHECKING:` and `try: import x except ImportError:` guards
+    without descending into functions, classes or expressions.
+    """
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+        elif isinstance(node, ast.If):
+            yield from module_imports(node.body)
+            yield from module_imports(node.orelse)
+        elif isinstance(node, (ast.Try, ast.TryStar)):
+            for block in (node.body, node.orelse, node.finalbody):
+                yield from module_imports(block)
+            for handler in node.handlers:
+                yield from module_imports(handler.body)
 
 
 def is_io_adapter(file_path):
     """Check if file is an I/O adapter by name or imports."""
     reasons = []
-    for pat in IO_PATTERNS:
-        if file_path.match(pat):
-            reasons.append(f"filename matches {pat}")
-            break
-    try:
-        tree = ast.parse(file_path.read_text(), filename=str(file_path))
-        for node in ast.walk(tree):
+    if m := _IO_NAME_RE.match(file_path.name):
+        reasons.append(f"filename matches {IO_PATTERNS[m.lastindex - 1]}")
+    raw = read_bytes(file_path) or b""
+    tree = get_tree(file_path) if any(m in raw for m in IO_MODULES_BYTES) else None
+    if tree is not None:
+        for node in module_imports(tree.body):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     if alias.name.split(".")[0] in IO_MODULES:
@@ -58,8 +85,6 @@ def is_io_adapter(file_path):
             elif isinstance(node, ast.ImportFrom) and node.module:
                 if node.module.split(".")[0] in IO_MODULES:
                     reasons.append(f"imports {node.module}")
-    except (OSError, SyntaxError):
-        pass
     return len(reasons) > 0, reasons
 
 
@@ -70,7 +95,10 @@ def find_behavioral_tests():
     behavioral_dirs = ["integration", "behavioral", "e2e", "adapters"]
     if not TEST_DIR.exists():
         return covered
-    for tf in TEST_DIR.rglob("test_*.py"):
+    for entry in iter_py(TEST_DIR):
+        if not entry.name.startswith("test_"):
+            continue
+        tf = Path(entry.path)
         in_behavioral = any(d in tf.parts for d in behavioral_dirs)
         is_behavioral = any(
             p in tf.name for p in ["_integration", "_e2e", "_behavioral", "_adapter"]
@@ -87,10 +115,10 @@ def find_behavioral_tests():
 def load_baseline():
     if not BASELINE_PATH.exists():
         return {}
-    return json.loads(BASELINE_PATH.read_text())
+    return loads(BASELINE_PATH.read_bytes())
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="Behavioral Test Pairing")
     parser.add_argument("--changed-files", nargs="*", default=None)
     parser.add_argument("--update-baseline", action="store_true")
@@ -100,23 +128,24 @@ def main():
     adapters = []
     if args.changed_files:
         for p in args.changed_files:
-            path = Path(p) if Path(p).is_absolute() else PROJECT_ROOT / p
-            if path.exists() and path.suffix == ".py":
+            path = PROJECT_ROOT / p
+            if path.suffix == ".py" and path.exists():
                 is_adapter, reasons = is_io_adapter(path)
                 if is_adapter:
                     adapters.append((path, reasons))
     else:
         if SRC_DIR.exists():
-            for f in SRC_DIR.rglob("*.py"):
-                if f.name == "__init__.py":
+            for entry in iter_py(SRC_DIR):
+                if entry.name == "__init__.py":
                     continue
+                f = Path(entry.path)
                 is_adapter, reasons = is_io_adapter(f)
                 if is_adapter:
                     adapters.append((f, reasons))
 
     if not adapters:
         print("Behavioral Pairing: No I/O adapters found.")
-        sys.exit(0)
+        return 0
 
     behavioral = find_behavioral_tests()
     missing = []
@@ -130,21 +159,26 @@ def main():
         for _, mod, _ in missing:
             baseline[mod] = True
         BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        BASELINE_PATH.write_bytes(dumps(baseline, indent=True, sort_keys=True) + b"\n")
         print(f"Baseline updated: {len(missing)} adapter(s) grandfathered")
-        sys.exit(0)
+        return 0
 
     if missing:
-        print(f"Behavioral Pairing FAILED — {len(missing)} adapter(s) without tests")
-        for rel, mod, reasons in missing:
-            print(f"  {rel}: {', '.join(reasons)}")
-        print("\nFix: Create behavioral tests in tests/integration/adapters/")
-        print("     Behavioral tests use REAL I/O (not mocks) to verify behavior.")
-        sys.exit(1)
+        print(
+            "\n".join(
+                [
+                    f"Behavioral Pairing FAILED — {len(missing)} adapter(s) without tests",
+                    *(f"  {rel}: {', '.join(reasons)}" for rel, _, reasons in missing),
+                    "\nFix: Create behavioral tests in tests/integration/adapters/",
+                    "     Behavioral tests use REAL I/O (not mocks) to verify behavior.",
+                ]
+            )
+        )
+        return 1
 
     print(f"Behavioral Pairing PASSED — {len(adapters)} adapter(s) checked")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
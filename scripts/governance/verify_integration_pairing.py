@@ -12,15 +12,21 @@ Usage:
 
 import argparse
 import ast
-import json
 import sys
 from pathlib import Path
 
+from _ast_index import get_tree, read_bytes
+from _filecache import cached_map_files
+from _fs import iter_py
+from _jsonio import dumps, loads
+
 # ADAPT: Project root, routes directory, test directory
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 ROUTES_DIR = PROJECT_ROOT / "src" / "routes"  # ADAPT: Flask/FastAPI routes location
 TEST_DIR = PROJECT_ROOT / "tests"
 BASELINE_PATH = PROJECT_ROOT / ".memory-layer" / "baselines" / "integration-pairing.json"
+# ADAPT: Byte patterns every route-defining file contains; others skip the parse
+ROUTE_MARKERS = (b".route(", b"@route(")
 
 
 class RouteVisitor(ast.NodeVisitor):
@@ -53,19 +59,38 @@ class RouteVisitor(ast.NodeVisitor):
         return path, methods
 
 
+def has_routes(path):
+    """Cheap byte-level gate: False means path cannot define a route."""
+    raw = read_bytes(path)
+    return raw is not None and any(m in raw for m in ROUTE_MARKERS)
+
+
+def extract_routes(path):
+    """[[route path, METHOD, lineno], ...] declared in path; [] if it has none or cannot be parsed."""
+    if not has_routes(path):
+        return []
+    tree = get_tree(path)
+    if tree is None:
+        return []
+    visitor = RouteVisitor()
+    visitor.visit(tree)
+    return [list(route) for route in visitor.routes]
+
+
 def find_test_functions():
     """Find all test_* function names in test directory."""
     funcs = set()
     if not TEST_DIR.exists():
         return funcs
-    for tf in TEST_DIR.rglob("test_*.py"):
-        try:
-            tree = ast.parse(tf.read_text(), filename=str(tf))
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
-                    funcs.add(node.name.lower())
-        except (OSError, SyntaxError):
-            pass
+    for entry in iter_py(TEST_DIR):
+        if not entry.name.startswith("test_"):
+            continue
+        tree = get_tree(entry.path)
+        if tree is None:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
+                funcs.add(node.name.lower())
     return funcs
 
 
@@ -89,10 +114,10 @@ def route_to_patterns(route_path, method):
 def load_baseline():
     if not BASELINE_PATH.exists():
         return {}
-    return json.loads(BASELINE_PATH.read_text())
+    return loads(BASELINE_PATH.read_bytes())
 
 
-def main():
+def run():
     parser = argparse.ArgumentParser(description="Integration Test Pairing")
     parser.add_argument("--changed-files", nargs="*", default=None)
     parser.add_argument("--update-baseline", action="store_true")
@@ -101,54 +126,67 @@ def main():
     baseline = load_baseline()
     route_files = []
     if args.changed_files:
-        route_files = [Path(f) for f in args.changed_files if Path(f).exists()]
+        # Missing files need no stat here: get_tree() returns None for them
+        paths = [Path(f) for f in args.changed_files]
+        route_files = [PROJECT_ROOT / p for p in paths if p.suffix == ".py"]
     elif ROUTES_DIR.exists():
         route_files = list(ROUTES_DIR.glob("*.py"))
 
+    # Routes per file are cached by (mtime_ns, size): unchanged files skip the read and parse
     all_routes = []
-    for rf in route_files:
-        try:
-            tree = ast.parse(rf.read_text(), filename=str(rf))
-        except (OSError, SyntaxError):
-            continue
-        visitor = RouteVisitor()
-        visitor.visit(tree)
-        rel = str(rf.relative_to(PROJECT_ROOT)).replace("\\", "/")
-        for path, method, lineno in visitor.routes:
-            all_routes.append((path, method, lineno, rel))
+    for rf, routes in zip(
+        route_files,
+        cached_map_files("integration-routes", extract_routes, route_files),
+        strict=True,
+    ):
+        if routes:
+            rel = str(rf.relative_to(PROJECT_ROOT)).replace("\\", "/")
+            all_routes.extend((path, method, lineno, rel) for path, method, lineno in routes)
 
     if not all_routes:
         print("Integration Pairing: No routes found.")
-        sys.exit(0)
+        return 0
 
     test_funcs = find_test_functions()
-    missing = []
-    for path, method, lineno, file in all_routes:
-        key = f"{method} {path}"
-        if key in baseline:
-            continue
-        patterns = route_to_patterns(path, method)
-        if not any(p in test_funcs for p in patterns if p):
-            missing.append((path, method, file, lineno))
+    candidates = {
+        route: {p for p in route_to_patterns(route[0], route[1]) if p}
+        for route in all_routes
+        if f"{route[1]} {route[0]}" not in baseline
+    }
+    # One intersection against the test names, then per-route disjointness checks
+    found = set().union(*candidates.values()) & test_funcs
+    missing = [
+        (path, method, file, lineno)
+        for (path, method, lineno, file), patterns in candidates.items()
+        if found.isdisjoint(patterns)
+    ]
 
     if args.update_baseline:
         for path, method, _, _ in missing:
             baseline[f"{method} {path}"] = True
         BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        BASELINE_PATH.write_bytes(dumps(baseline, indent=True, sort_keys=True) + b"\n")
         print(f"Baseline updated: {len(missing)} route(s) grandfathered")
-        sys.exit(0)
+        return 0
 
     if missing:
-        print(f"Integration Pairing FAILED — {len(missing)} route(s) without tests")
-        for path, method, file, lineno in missing:
-            print(f"  {method} {path} ({file}:{lineno})")
-        print("\nFix: Create integration test in tests/test_<module>_endpoints.py")
-        sys.exit(1)
+        print(
+            "\n".join(
+                [
+                    f"Integration Pairing FAILED — {len(missing)} route(s) without tests",
+                    *(
+                        f"  {method} {path} ({file}:{lineno})"
+                        for path, method, file, lineno in missing
+                    ),
+                    "\nFix: Create integration test in tests/test_<module>_endpoints.py",
+                ]
+            )
+        )
+        return 1
 
     print(f"Integration Pairing PASSED — {len(all_routes)} route(s) checked")
-    sys.exit(0)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
@@ -1,19 +1,44 @@
 #!/usr/bin/env python3
 """Layer 10: Dead Code Gate — reject bare except clauses."""
 
-import subprocess
+import os
+import re
 import sys
 
+# ADAPT: Source directory to scan
+SRC_DIR = "src"
+SKIP_DIRS = {"__pycache__", ".venv", "node_modules"}
+# A line that opens with "except:" (any indentation), scanned as raw bytes
+BARE_EXCEPT_RE = re.compile(rb"^[ \t]*except[ \t]*:", re.MULTILINE)
+
+
+def find_bare_excepts(root: str) -> list[str]:
+    """grep-style "path:line:text" hits for every bare except under root."""
+    hits = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                with open(path, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            for m in BARE_EXCEPT_RE.finditer(data):
+                line = data.count(b"\n", 0, m.start()) + 1
+                end = data.find(b"\n", m.start())
+                text = data[m.start() : end if end != -1 else len(data)]
+                hits.append(f"{path}:{line}:{text.decode('utf-8', 'replace').rstrip()}")
+    return hits
+
 
 def main() -> int:
-    result = subprocess.run(
-        ["grep", "-rn", "except:", "src/"],
-        capture_output=True,
-        text=True,
-    )
-    if result.stdout:
+    hits = find_bare_excepts(SRC_DIR)
+    if hits:
         print("FAIL: bare except found (use specific exception types):")
-        print(result.stdout)
+        print("\n".join(hits))
         return 1
     print("PASS: no bare excepts")
     return 0
@@ -1,7 +1,7 @@
 import logging
 import os
 import signal
-import time
+import threading
 
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
@@ -9,13 +9,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-_running = True
+_stop = threading.Event()
 
 
 def _handle_signal(signum: int, _frame: object) -> None:
-    global _running
     logger.info("Received signal %s — shutting down", signum)
-    _running = False
+    _stop.set()
 
 
 def main() -> None:
@@ -25,10 +24,9 @@ def main() -> None:
     logger.info("Toy app starting — APP_ENV=%s", os.getenv("APP_ENV", "development"))
     logger.info("Ready. Replace this placeholder with your web framework (FastAPI, Flask, etc.)")
 
-    while _running:  # pragma: no cover
-        time.sleep(1)  # pragma: no cover
+    _stop.wait()
 
-    logger.info("Toy app stopped.")  # pragma: no cover
+    logger.info("Toy app stopped.")
 
 
 if __name__ == "__main__":
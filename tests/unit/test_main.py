@@ -1,8 +1,8 @@
 """
 Unit tests for src.main — Pure Core Pattern.
 
-The blocking event loop is excluded via pragma: no cover.
-All other branches are tested here with no real I/O.
+The blocking wait on _stop is patched out, so main() returns immediately.
+All branches are tested here with no real I/O.
 """
 
 import pytest
@@ -11,28 +11,26 @@ import src.main as m
 
 @pytest.mark.unit
 class TestHandleSignal:
-    def test_sets_running_false(self) -> None:
-        original = m._running
+    def test_sets_stop_event(self) -> None:
         try:
             m._handle_signal(15, None)
-            assert m._running is False
+            assert m._stop.is_set()
         finally:
-            m._running = original
+            m._stop.clear()
 
     def test_accepts_any_signum(self) -> None:
-        original = m._running
         try:
             m._handle_signal(2, None)
-            assert m._running is False
+            assert m._stop.is_set()
         finally:
-            m._running = original
+            m._stop.clear()
 
 
 @pytest.mark.unit
 class TestMain:
     def test_registers_signal_handlers(self, mocker: pytest.MonkeyPatch) -> None:
         mock_signal = mocker.patch("src.main.signal.signal")
-        mocker.patch.object(m, "_running", False)
+        mocker.patch.object(m._stop, "wait")
         m.main()
         assert mock_signal.call_count == 2
 
@@ -40,7 +38,7 @@ class TestMain:
         self, mocker: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
     ) -> None:
         mocker.patch("src.main.signal.signal")
-        mocker.patch.object(m, "_running", False)
+        mocker.patch.object(m._stop, "wait")
         import logging
 
         with caplog.at_level(logging.INFO, logger="src.main"):